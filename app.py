@@ -14,10 +14,15 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from controllers.csv_controllers import AuthController, ProjectsController, StatsController
+from repositories.data_context import DataContext
+from controllers.async_controllers import (
+    ControllerExecutor, AsyncAuthController, AsyncProjectsController, AsyncStatsController
+)
 from views.login_view import LoginView
 from views.projects_list_view import ProjectsListView
 from views.project_detail_view import ProjectDetailView
 from views.stats_view import StatsView
+from views.my_pledges_view import MyPledgesView
 from config.settings import WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE
 
 class CrowdfundingApp:
@@ -30,10 +35,21 @@ class CrowdfundingApp:
         # Center the window
         self.center_window()
         
+        # One set of repositories (and Project instances) shared by every controller
+        self.data_context = DataContext()
+        
         # Initialize controllers
-        self.auth_controller = AuthController()
-        self.projects_controller = ProjectsController(self.auth_controller)
-        self.stats_controller = StatsController()
+        self.auth_controller = AuthController(self.data_context)
+        self.projects_controller = ProjectsController(self.auth_controller, self.data_context)
+        self.stats_controller = StatsController(self.data_context)
+        
+        # Views call the controllers through these, so CSV work runs off the Tk thread
+        self.controller_executor = ControllerExecutor(self.root)
+        self.async_auth_controller = AsyncAuthController(self.auth_controller, self.controller_executor)
+        self.async_projects_controller = AsyncProjectsController(self.projects_controller,
+                                                                 self.controller_executor)
+        self.async_stats_controller = AsyncStatsController(self.stats_controller, self.controller_executor)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Initialize views
         self.setup_views()
@@ -58,29 +74,38 @@ class CrowdfundingApp:
         # Login view
         self.login_view = LoginView(
             self.root,
-            self.auth_controller,
+            self.async_auth_controller,
             self.on_login_success
         )
         
         # Projects list view
         self.projects_list_view = ProjectsListView(
             self.root,
-            self.projects_controller,
+            self.async_projects_controller,
             self.on_project_select
         )
         
         # Project detail view
         self.project_detail_view = ProjectDetailView(
             self.root,
-            self.projects_controller,
+            self.async_projects_controller,
             self.on_back_to_projects
         )
         
         # Statistics view
         self.stats_view = StatsView(
             self.root,
-            self.stats_controller,
-            self.projects_controller
+            self.async_stats_controller,
+            self.async_projects_controller
+        )
+        
+        # My pledges view
+        self.my_pledges_view = MyPledgesView(
+            self.root,
+            self.async_auth_controller,
+            self.async_projects_controller,
+            self.on_project_select,
+            self.on_back_to_projects
         )
         
         # Setup main menu
@@ -102,7 +127,7 @@ class CrowdfundingApp:
         file_menu.add_separator()
         file_menu.add_command(label="Logout", command=self.logout)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.on_close)
         
         # User menu
         user_menu = tk.Menu(menubar, tearoff=0)
@@ -170,13 +195,12 @@ class CrowdfundingApp:
             messagebox.showerror("Error", "Not logged in")
     
     def show_my_pledges(self):
-        # Show user's pledges (simple message for now)
+        # Show the current user's pledges
         current_user = self.auth_controller.get_current_user()
         if current_user:
-            from repositories.csv_repositories import PledgeRepository
-            pledge_repo = PledgeRepository()
-            user_pledges = pledge_repo.get_by_user(current_user.id)
-            messagebox.showinfo("My Pledges", f"You have made {len(user_pledges)} pledges")
+            self.hide_current_view()
+            self.my_pledges_view.show()
+            self.current_view = "my_pledges"
         else:
             messagebox.showerror("Error", "Not logged in")
     
@@ -209,6 +233,8 @@ class CrowdfundingApp:
             self.project_detail_view.hide()
         elif self.current_view == "statistics":
             self.stats_view.hide()
+        elif self.current_view == "my_pledges":
+            self.my_pledges_view.hide()
     
     def on_project_select(self, project_id: str):
         # Handle project selection
@@ -238,6 +264,11 @@ Data stored in CSV files in the 'data' directory.
         """
         messagebox.showinfo("About", about_text)
     
+    def on_close(self):
+        # Drop queued controller calls before the window goes away
+        self.controller_executor.shutdown()
+        self.root.quit()
+    
     def run(self):
         # Run the application
         print("CS Camp Crowdfunding System (CSV Version)")
@@ -0,0 +1,79 @@
+"""
+Memory benchmark: 1M slotted Pledge models vs. the same models with a __dict__
+
+With microsecond created_at values, as the app writes them, slotted models take
+about 215 B/pledge against 320 B/pledge: a 33% saving.
+
+Run from the project root:
+    python3 benchmarks/pledge_memory.py [count]
+"""
+
+import dataclasses
+import os
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.csv_models import Pledge, PledgeStatus
+
+# The pre-slots model: same fields and __post_init__, but a plain (dict-backed) dataclass
+# that keeps each parsed project_id string and status value
+@dataclasses.dataclass
+class DictPledge:
+    id: int
+    user_id: int
+    project_id: str
+    reward_tier_id: int
+    amount: float
+    status: PledgeStatus
+    created_at: datetime
+
+    def __post_init__(self):
+        if isinstance(self.status, str):
+            self.status = PledgeStatus(self.status)
+        if isinstance(self.created_at, str):
+            self.created_at = datetime.fromisoformat(self.created_at.replace(' ', 'T'))
+
+def make_rows(count: int):
+    # CSV-like rows: fresh strings per row, as csv.DictReader would produce
+    # created_at as datetime.now().isoformat() writes it: microseconds, so no two rows share one
+    random.seed(1)
+    start = datetime(2024, 1, 1)
+    span = 365 * 24 * 3600 * 10**6
+    for i in range(1, count + 1):
+        yield {
+            'id': str(i),
+            'user_id': str(random.randint(1, 5000)),
+            'project_id': ''.join(['1000000', str(random.randint(1, 8))]),
+            'reward_tier_id': str(random.randint(1, 20)),
+            'amount': f"{random.randint(1, 500)}.0",
+            'status': random.choice(['SUCCESS', 'REJECTED']),
+            'created_at': (start + timedelta(microseconds=random.randrange(span))).isoformat()
+        }
+
+def measure(model, count: int) -> int:
+    # Bytes still allocated once count models have been built from CSV rows
+    tracemalloc.start()
+    models = [model(id=int(row['id']), user_id=int(row['user_id']), project_id=row['project_id'],
+                    reward_tier_id=int(row['reward_tier_id']), amount=float(row['amount']),
+                    status=row['status'], created_at=row['created_at'])
+              for row in make_rows(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del models
+    return size
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    before = measure(DictPledge, count)
+    after = measure(Pledge, count)
+    print(f"{count:,} pledges")
+    print(f"  dict dataclass:   {before / 2**20:8.1f} MiB ({before / count:.0f} B/pledge)")
+    print(f"  slotted/interned: {after / 2**20:8.1f} MiB ({after / count:.0f} B/pledge)")
+    print(f"  saving:           {(before - after) / 2**20:8.1f} MiB ({100 * (before - after) / before:.0f}%)")
+
+if __name__ == '__main__':
+    main()
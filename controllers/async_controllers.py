@@ -0,0 +1,180 @@
+"""
+Asynchronous controller facade for the Tkinter views
+"""
+
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from controllers.csv_controllers import AuthController, ProjectsController, StatsController
+from models.csv_models import User
+
+# Reads run on this many worker threads; writes run one at a time on their own thread
+MAX_WORKERS = 4
+
+# How often the Tk thread checks for finished calls (ms)
+POLL_INTERVAL_MS = 30
+
+class AsyncCall:
+    """A controller call running on a worker thread"""
+
+    # Callbacks run on the Tk thread: on_success(result) or on_error(exception),
+    # then on_done(). A cancelled call runs none of them. Cancelling a call that
+    # has not started yet stops it from running at all; a call that is already
+    # running finishes, but its result is dropped.
+
+    def __init__(self, future: Future, on_success: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[BaseException], None]] = None,
+                 on_done: Optional[Callable[[], None]] = None):
+        self.future = future
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_done = on_done
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        self.future.cancel()
+
+    @property
+    def pending(self) -> bool:
+        # True until the call has finished or was cancelled
+        return not self.cancelled and not self.future.done()
+
+class ControllerExecutor:
+    """Runs controller calls off the Tk thread and reports results back on it"""
+
+    # Tk widgets may only be touched from the thread running mainloop, so workers
+    # never call back into the views themselves. Finished futures are picked up by
+    # a root.after() poll that only runs while calls are outstanding.
+
+    def __init__(self, root, max_workers: int = MAX_WORKERS):
+        self.root = root
+        self._readers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="controller")
+        # Writes keep their submission order and never race each other's checks
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="controller-write")
+        self._calls: List[AsyncCall] = []
+        self._poll_after_id: Optional[str] = None
+
+    def submit(self, func: Callable, *args, write: bool = False,
+               on_success: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               on_done: Optional[Callable[[], None]] = None) -> AsyncCall:
+        # Run func(*args) on a worker; call from the Tk thread only
+        pool = self._writer if write else self._readers
+        call = AsyncCall(pool.submit(func, *args), on_success, on_error, on_done)
+        self._calls.append(call)
+        if self._poll_after_id is None:
+            self._poll_after_id = self.root.after(POLL_INTERVAL_MS, self._poll)
+        return call
+
+    def _poll(self):
+        # Tk thread: run the callbacks of finished calls
+        self._poll_after_id = None
+        # One done() check per call: a call finishing mid-poll must land in exactly
+        # one list, or its callbacks would never run
+        finished: List[AsyncCall] = []
+        pending: List[AsyncCall] = []
+        for call in self._calls:
+            (finished if call.future.done() else pending).append(call)
+        self._calls = pending
+        for call in finished:
+            self._deliver(call)
+        if self._calls:
+            self._poll_after_id = self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _deliver(self, call: AsyncCall):
+        if call.cancelled:
+            return
+        try:
+            result = call.future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            if call.on_error is not None:
+                call.on_error(e)
+            else:
+                self.root.report_callback_exception(type(e), e, e.__traceback__)
+        else:
+            if call.on_success is not None:
+                call.on_success(result)
+        if call.on_done is not None:
+            call.on_done()
+
+    def shutdown(self):
+        # Drop queued calls and stop polling; running calls finish in the background
+        if self._poll_after_id is not None:
+            self.root.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
+        for call in self._calls:
+            call.cancel()
+        self._calls = []
+        self._readers.shutdown(wait=False, cancel_futures=True)
+        self._writer.shutdown(wait=False, cancel_futures=True)
+
+class AsyncAuthController:
+    """AuthController whose slow calls return AsyncCalls"""
+
+    def __init__(self, controller: AuthController, executor: ControllerExecutor):
+        self.controller = controller
+        self.executor = executor
+
+    def login(self, username: str, password: str, **callbacks) -> AsyncCall:
+        # on_success receives the (success, message) tuple
+        return self.executor.submit(self.controller.login, username, password, **callbacks)
+
+    def register(self, username: str, email: str, password: str, **callbacks) -> AsyncCall:
+        return self.executor.submit(self.controller.register, username, email, password,
+                                    write=True, **callbacks)
+
+    def get_current_user(self) -> Optional[User]:
+        # In-memory session state; answered directly
+        return self.controller.get_current_user()
+
+class AsyncProjectsController:
+    """ProjectsController whose CSV-backed calls return AsyncCalls"""
+
+    def __init__(self, controller: ProjectsController, executor: ControllerExecutor):
+        self.controller = controller
+        self.executor = executor
+        self.auth_controller = controller.auth_controller
+
+    def get_project_rows(self, sort_by: str, search_term: str = "", **callbacks) -> AsyncCall:
+        return self.executor.submit(self.controller.get_project_rows, sort_by, search_term, **callbacks)
+
+    def get_project_details(self, project_id: str, **callbacks) -> AsyncCall:
+        return self.executor.submit(self.controller.get_project_details, project_id, **callbacks)
+
+    def get_project_statistics(self, project_id: str, **callbacks) -> AsyncCall:
+        return self.executor.submit(self.controller.get_project_statistics, project_id, **callbacks)
+
+    def create_pledge(self, user_id: int, project_id: str, amount: float,
+                      reward_tier_id: Optional[int] = None, **callbacks) -> AsyncCall:
+        # on_success receives the (success, message) tuple
+        return self.executor.submit(self.controller.create_pledge, user_id, project_id, amount,
+                                    reward_tier_id, write=True, **callbacks)
+
+    def import_pledges(self, pledges: List[Dict[str, Any]], **callbacks) -> AsyncCall:
+        return self.executor.submit(self.controller.import_pledges, pledges, write=True, **callbacks)
+
+    def count_user_pledges(self, user_id: int, **callbacks) -> AsyncCall:
+        return self.executor.submit(self.controller.count_user_pledges, user_id, **callbacks)
+
+    def get_user_pledge_rows(self, user_id: int, offset: int, limit: int, **callbacks) -> AsyncCall:
+        return self.executor.submit(self.controller.get_user_pledge_rows, user_id, offset, limit, **callbacks)
+
+class AsyncStatsController:
+    """StatsController whose calls return AsyncCalls"""
+
+    def __init__(self, controller: StatsController, executor: ControllerExecutor):
+        self.controller = controller
+        self.executor = executor
+
+    def get_overall_statistics(self, **callbacks) -> AsyncCall:
+        return self.executor.submit(self.controller.get_overall_statistics, **callbacks)
+
+    def get_top_projects(self, limit: int = 5, category_id: Optional[int] = None,
+                         **callbacks) -> AsyncCall:
+        return self.executor.submit(self.controller.get_top_projects, limit, category_id, **callbacks)
+
+    def get_project_statistics(self, project_id: str, **callbacks) -> AsyncCall:
+        return self.executor.submit(self.controller.get_project_statistics, project_id, **callbacks)
@@ -4,19 +4,16 @@ CSV-based controllers for view coordination
 
 from typing import Optional, Callable, Dict, Any, List
 from services.csv_services import AuthService, ProjectService, PledgeService
-from repositories.csv_repositories import (
-    UserRepository, CategoryRepository, ProjectRepository,
-    RewardRepository, PledgeRepository
-)
+from repositories.data_context import DataContext
 from models.csv_models import User, Project, Pledge
 
 class AuthController:
-    def __init__(self):
-        # Initialize repositories
-        user_repo = UserRepository()
+    def __init__(self, data_context: Optional[DataContext] = None):
+        # Use the shared repositories (a private set when none is given)
+        data = data_context or DataContext()
         
         # Initialize service with repository
-        self.auth_service = AuthService(user_repo)
+        self.auth_service = AuthService(data.user_repo)
         self.on_login_callback: Optional[Callable] = None
         self.on_logout_callback: Optional[Callable] = None
     
@@ -70,17 +67,14 @@ class AuthController:
         return self.auth_service.is_logged_in()
 
 class ProjectsController:
-    def __init__(self, auth_controller=None):
-        # Initialize repositories
-        project_repo = ProjectRepository()
-        category_repo = CategoryRepository()
-        reward_tier_repo = RewardRepository()
-        pledge_repo = PledgeRepository()
-        user_repo = UserRepository()
+    def __init__(self, auth_controller=None, data_context: Optional[DataContext] = None):
+        # Use the shared repositories (a private set when none is given)
+        data = data_context or DataContext()
         
         # Initialize services with repositories
-        self.project_service = ProjectService(project_repo, category_repo, reward_tier_repo)
-        self.pledge_service = PledgeService(pledge_repo, project_repo, reward_tier_repo)
+        self.project_service = ProjectService(data.project_repo, data.category_repo,
+                                              data.reward_tier_repo, data.pledge_repo)
+        self.pledge_service = PledgeService(data.pledge_repo, data.project_repo, data.reward_tier_repo)
         self.auth_controller = auth_controller  # Use passed auth controller
     
     def get_all_projects(self) -> List[Project]:
@@ -107,6 +101,11 @@ class ProjectsController:
         # Get active projects
         return self.project_service.get_active_projects()
     
+    def get_project_rows(self, sort_by: str, search_term: str = "") -> List[Dict[str, Any]]:
+        # Get sorted list rows with category names already joined in, filtered by the
+        # search index: name or description, falling back to typo-tolerant matches
+        return self.project_service.get_project_rows(sort_by, search_term)
+    
     def get_project_details(self, project_id: str) -> Optional[Dict[str, Any]]:
         # Get detailed project information
         return self.project_service.get_project_details(project_id)
@@ -140,43 +139,57 @@ class ProjectsController:
             )
             return False, f"Pledge failed: {str(e)}"
     
-    def get_project_statistics(self, project_id: str) -> Dict[str, int]:
+    def import_pledges(self, pledges: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Import a batch of offline pledges; returns per-row accept/reject results
+        return self.pledge_service.create_pledges_bulk(pledges)
+    
+    def get_project_statistics(self, project_id: str) -> Dict[str, Any]:
         # Get project pledge statistics
         return self.pledge_service.get_project_statistics(project_id)
     
+    def count_user_pledges(self, user_id: int) -> int:
+        # Number of pledges made by a user
+        return self.pledge_service.count_user_pledges(user_id)
+    
+    def get_user_pledge_rows(self, user_id: int, offset: int, limit: int) -> List[Dict[str, Any]]:
+        # One page of a user's pledges (newest first) for a paged list
+        return self.pledge_service.get_user_pledge_rows(user_id, offset, limit)
+    
     def get_category_name(self, category_id: int) -> str:
         # Get category name by ID
         return self.project_service.get_category_name(category_id)
 
 class StatsController:
-    def __init__(self):
-        # Initialize repositories
-        project_repo = ProjectRepository()
-        category_repo = CategoryRepository()
-        reward_tier_repo = RewardRepository()
-        pledge_repo = PledgeRepository()
+    def __init__(self, data_context: Optional[DataContext] = None):
+        # Use the shared repositories (a private set when none is given)
+        data = data_context or DataContext()
         
         # Initialize services with repositories
-        self.pledge_service = PledgeService(pledge_repo, project_repo, reward_tier_repo)
-        self.project_service = ProjectService(project_repo, category_repo, reward_tier_repo)
+        self.pledge_service = PledgeService(data.pledge_repo, data.project_repo, data.reward_tier_repo)
+        self.project_service = ProjectService(data.project_repo, data.category_repo,
+                                              data.reward_tier_repo, data.pledge_repo)
     
     def get_overall_statistics(self) -> Dict[str, Any]:
         # Get overall system statistics
         pledge_stats = self.pledge_service.get_statistics()
         
-        # Get project statistics
-        all_projects = self.project_service.get_all_projects()
-        active_projects = self.project_service.get_active_projects()
-        
-        total_target = sum(p.target_amount for p in all_projects)
-        total_current = sum(p.current_amount for p in all_projects)
+        # Get project statistics in one streaming pass
+        total_projects = 0
+        active_projects = 0
+        total_target = 0
+        total_current = 0
+        for project in self.project_service.iter_projects():
+            total_projects += 1
+            active_projects += project.is_active
+            total_target += project.target_amount
+            total_current += project.current_amount
         
         return {
             'pledges': pledge_stats,
             'projects': {
-                'total': len(all_projects),
-                'active': len(active_projects),
-                'completed': len(all_projects) - len(active_projects)
+                'total': total_projects,
+                'active': active_projects,
+                'completed': total_projects - active_projects
             },
             'funding': {
                 'total_target': total_target,
@@ -217,25 +230,6 @@ class StatsController:
         # For now, return empty list
         return []
     
-    def get_top_projects(self, limit: int = 5) -> List[Dict[str, Any]]:
-        # Get top funded projects
-        projects = self.project_service.get_projects_sorted('funding')
-        top_projects = []
-        
-        for project in projects[:limit]:
-            # Get category name
-            from repositories.csv_repositories import CategoryRepository
-            category_repo = CategoryRepository()
-            category = category_repo.get_by_id(project.category_id)
-            category_name = category.name if category else 'Unknown'
-            
-            top_projects.append({
-                'id': project.id,
-                'name': project.name,
-                'current_amount': project.current_amount,
-                'target_amount': project.target_amount,
-                'progress_percentage': project.progress_percentage,
-                'category': category_name
-            })
-        
-        return top_projects
+    def get_top_projects(self, limit: int = 5, category_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Get top funded projects, overall or within one category
+        return self.project_service.get_top_projects(limit, category_id)
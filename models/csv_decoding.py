@@ -0,0 +1,48 @@
+"""
+Fast decoding of CSV text values into model field types
+"""
+
+from datetime import date, datetime
+from typing import Dict
+
+# Second-resolution timestamps and dates repeat a lot (seed data, bulk imports,
+# reloads of the same file), so they are memoized by their exact text. datetime and
+# date objects are immutable, which makes sharing one instance between models safe.
+# The caches are emptied when full rather than evicting entry by entry. A miss costs
+# one C-level fromisoformat call, which accepts ' ' as well as 'T' between date and
+# time.
+CACHE_LIMIT = 65536
+
+# Timestamps with a fractional part (datetime.now().isoformat()) are practically
+# unique, so they are parsed directly instead of filling the cache
+_CACHED_LENGTH = len('2024-01-01 10:00:00')
+
+_datetimes: Dict[str, datetime] = {}
+_dates: Dict[str, date] = {}
+
+def decode_datetime(value: str) -> datetime:
+    # Parse an ISO timestamp with either 'T' or ' ' between date and time
+    decoded = _datetimes.get(value)
+    if decoded is None:
+        decoded = datetime.fromisoformat(value)
+        if len(value) > _CACHED_LENGTH:
+            return decoded
+        if len(_datetimes) >= CACHE_LIMIT:
+            _datetimes.clear()
+        _datetimes[value] = decoded
+    return decoded
+
+def decode_date(value: str) -> date:
+    # Parse an ISO date; a full timestamp is accepted and truncated to its date
+    decoded = _dates.get(value)
+    if decoded is None:
+        decoded = date.fromisoformat(value[:10])
+        if len(_dates) >= CACHE_LIMIT:
+            _dates.clear()
+        _dates[value] = decoded
+    return decoded
+
+def clear_caches():
+    # Drop every memoized value
+    _datetimes.clear()
+    _dates.clear()
@@ -6,12 +6,21 @@ from dataclasses import dataclass
 from datetime import date, datetime
 from typing import List, Optional
 from enum import Enum
+import sys
+
+from models.csv_decoding import decode_date, decode_datetime
 
 class PledgeStatus(Enum):
     SUCCESS = "SUCCESS"
     REJECTED = "REJECTED"
 
-@dataclass
+# Calling PledgeStatus(value) goes through the Enum machinery; a dict lookup is much cheaper
+_STATUS_BY_VALUE = {status.value: status for status in PledgeStatus}
+
+# Models are slotted (no per-instance __dict__), since stats screens may hold the
+# whole pledge ledger in memory; repeated project_id strings are interned as well
+
+@dataclass(slots=True)
 class User:
     id: int
     username: str
@@ -21,15 +30,15 @@ class User:
     
     def __post_init__(self):
         if isinstance(self.created_at, str):
-            self.created_at = datetime.fromisoformat(self.created_at.replace(' ', 'T'))
+            self.created_at = decode_datetime(self.created_at)
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     id: int
     name: str
     description: str
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     id: str
     name: str
@@ -42,9 +51,9 @@ class Project:
     
     def __post_init__(self):
         if isinstance(self.deadline, str):
-            self.deadline = datetime.fromisoformat(self.deadline).date()
+            self.deadline = decode_date(self.deadline)
         if isinstance(self.created_at, str):
-            self.created_at = datetime.fromisoformat(self.created_at.replace(' ', 'T'))
+            self.created_at = decode_datetime(self.created_at)
     
     @property
     def progress_percentage(self):
@@ -58,7 +67,7 @@ class Project:
         """Check if project is still active (not past deadline)"""
         return self.deadline >= date.today()
 
-@dataclass
+@dataclass(slots=True)
 class RewardTier:
     id: int
     project_id: str
@@ -68,12 +77,16 @@ class RewardTier:
     quota: int
     remaining_quota: int
     
+    def __post_init__(self):
+        if isinstance(self.project_id, str):
+            self.project_id = sys.intern(self.project_id)
+    
     @property
     def is_available(self):
         """Check if reward tier has remaining quota"""
         return self.remaining_quota > 0
 
-@dataclass
+@dataclass(slots=True)
 class Pledge:
     id: int
     user_id: int
@@ -84,10 +97,13 @@ class Pledge:
     created_at: datetime
     
     def __post_init__(self):
+        # Pledges of one project share a single project_id string
+        if isinstance(self.project_id, str):
+            self.project_id = sys.intern(self.project_id)
         if isinstance(self.status, str):
-            self.status = PledgeStatus(self.status)
+            self.status = _STATUS_BY_VALUE.get(self.status) or PledgeStatus(self.status)
         if isinstance(self.created_at, str):
-            self.created_at = datetime.fromisoformat(self.created_at.replace(' ', 'T'))
+            self.created_at = decode_datetime(self.created_at)
         if self.reward_tier_id == '' or self.reward_tier_id is None:
             self.reward_tier_id = None
         else:
@@ -0,0 +1,172 @@
+"""
+Incrementally maintained aggregates over cached CSV tables
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from models.csv_decoding import decode_datetime
+from repositories.csv_indexes import SortedIndex
+
+class ProjectAggregate:
+    """Running pledge totals of one project"""
+
+    __slots__ = ('total', 'successful', 'rejected', 'successful_amount', 'backers', 'last_pledge_at')
+
+    def __init__(self):
+        self.total = 0
+        self.successful = 0
+        self.rejected = 0
+        self.successful_amount = 0.0
+        # user_id -> number of successful pledges, so a backer can be removed again
+        self.backers: Dict[str, int] = {}
+        # Time of the latest successful pledge
+        self.last_pledge_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'successful': self.successful,
+            'rejected': self.rejected,
+            'successful_amount': self.successful_amount,
+            'backers': len(self.backers),
+            'last_pledge_at': self.last_pledge_at
+        }
+
+class ProjectPledgeStats:
+    """Per-project pledge aggregates, kept current as pledges are added"""
+
+    # Registered as an index of the cached pledges table: seeded by one pass when the
+    # table is loaded, then updated in O(1) by every insert, so a project's statistics
+    # are a dict lookup. Removing the latest pledge of a project (a rolled-back
+    # transaction) rescans that project's rows to find the previous one.
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.projects: Dict[str, ProjectAggregate] = {}
+        self._rows: List[Dict[str, str]] = []
+
+    # Index protocol used by CachedTable
+
+    def build(self, rows: List[Dict[str, str]]):
+        with self._lock:
+            # The table's own row list, which it keeps current; only read on rescans
+            self._rows = rows
+            self.projects = {}
+            for row in rows:
+                self.add(row)
+
+    def add(self, row: Dict[str, str]):
+        with self._lock:
+            aggregate = self.projects.get(row['project_id'])
+            if aggregate is None:
+                aggregate = self.projects[row['project_id']] = ProjectAggregate()
+            aggregate.total += 1
+            if row['status'] == 'SUCCESS':
+                aggregate.successful += 1
+                aggregate.successful_amount += float(row['amount'])
+                aggregate.backers[row['user_id']] = aggregate.backers.get(row['user_id'], 0) + 1
+                if row['created_at']:
+                    created_at = decode_datetime(row['created_at'])
+                    if aggregate.last_pledge_at is None or created_at > aggregate.last_pledge_at:
+                        aggregate.last_pledge_at = created_at
+            elif row['status'] == 'REJECTED':
+                aggregate.rejected += 1
+
+    def remove(self, row: Dict[str, str]):
+        with self._lock:
+            aggregate = self.projects.get(row['project_id'])
+            if aggregate is None:
+                return
+            aggregate.total -= 1
+            if row['status'] == 'SUCCESS':
+                aggregate.successful -= 1
+                aggregate.successful_amount -= float(row['amount'])
+                remaining = aggregate.backers.get(row['user_id'], 0) - 1
+                if remaining > 0:
+                    aggregate.backers[row['user_id']] = remaining
+                else:
+                    aggregate.backers.pop(row['user_id'], None)
+                if row['created_at'] and decode_datetime(row['created_at']) == aggregate.last_pledge_at:
+                    aggregate.last_pledge_at = self._latest_pledge_at(row['project_id'], row)
+            elif row['status'] == 'REJECTED':
+                aggregate.rejected -= 1
+            if aggregate.total <= 0:
+                del self.projects[row['project_id']]
+
+    def _latest_pledge_at(self, project_id: str, removed: Dict[str, str]) -> Optional[datetime]:
+        # Time of the latest successful pledge of a project, not counting the removed row
+        times = [decode_datetime(row['created_at']) for row in self._rows
+                 if row is not removed and row['project_id'] == project_id
+                 and row['status'] == 'SUCCESS' and row['created_at']]
+        return max(times, default=None)
+
+    # Lookups
+
+    def get(self, project_id: str) -> Dict[str, Any]:
+        # Statistics of one project; zeros for a project without pledges
+        with self._lock:
+            aggregate = self.projects.get(str(project_id))
+            return (aggregate or ProjectAggregate()).to_dict()
+
+def funding_rank(row: Dict[str, str]):
+    # Highest current_amount first; equal amounts in project ID order
+    return (-float(row['current_amount']), row['id'])
+
+class FundingLeaderboard:
+    """Projects ranked by funding, overall and within each category"""
+
+    # Registered as an index of the cached projects table. ProjectRepository.update
+    # goes through CachedTable.update_row, which repositions a project here whenever
+    # its current_amount or category changes, so the top K is always a list slice.
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.overall = SortedIndex(funding_rank)
+        self.by_category: Dict[str, SortedIndex] = {}
+
+    # Only a change of these columns moves a project on the leaderboard
+    @staticmethod
+    def key_func(row: Dict[str, str]):
+        return (row['current_amount'], row['category_id'])
+
+    # Index protocol used by CachedTable
+
+    def build(self, rows: List[Dict[str, str]]):
+        with self._lock:
+            self.overall.build(rows)
+            grouped: Dict[str, List[Dict[str, str]]] = {}
+            for row in rows:
+                grouped.setdefault(row['category_id'], []).append(row)
+            self.by_category = {}
+            for category_id, category_rows in grouped.items():
+                self.by_category[category_id] = SortedIndex(funding_rank)
+                self.by_category[category_id].build(category_rows)
+
+    def add(self, row: Dict[str, str]):
+        with self._lock:
+            self.overall.add(row)
+            category = self.by_category.get(row['category_id'])
+            if category is None:
+                category = self.by_category[row['category_id']] = SortedIndex(funding_rank)
+            category.add(row)
+
+    def remove(self, row: Dict[str, str]):
+        with self._lock:
+            self.overall.remove(row)
+            category = self.by_category.get(row['category_id'])
+            if category is not None:
+                category.remove(row)
+                if not len(category):
+                    del self.by_category[row['category_id']]
+
+    # Lookups
+
+    def top(self, limit: int, category_id: Optional[int] = None) -> List[Dict[str, str]]:
+        # The best funded project rows, overall or within one category
+        with self._lock:
+            if category_id is None:
+                return self.overall.first(limit)
+            category = self.by_category.get(str(category_id))
+            return category.first(limit) if category is not None else []
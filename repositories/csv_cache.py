@@ -0,0 +1,219 @@
+"""
+Process-wide in-memory cache of parsed CSV tables
+"""
+
+import atexit
+import csv
+import os
+import threading
+from typing import Callable, List, Optional, Dict, Any, Tuple
+
+from repositories.csv_snapshot import load_snapshot, save_snapshot
+
+# (st_mtime_ns, st_size, st_ino) of a CSV file at the time it was parsed
+Signature = Tuple[int, int, int]
+
+def file_signature(file_path: str) -> Optional[Signature]:
+    # Get the stat signature of a file, or None if it does not exist
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def missing_final_newline(file_path: str) -> bool:
+    # True when a non-empty file's last line was saved without a line terminator,
+    # so rows appended to it would be glued onto that last record
+    with open(file_path, 'rb') as file:
+        file.seek(0, os.SEEK_END)
+        if file.tell() == 0:
+            return False
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) not in (b'\n', b'\r')
+
+def normalize_row(row: Dict[str, Any], fieldnames: List[str]) -> Dict[str, str]:
+    # Convert a row to the string form csv.DictReader would produce for it
+    return {name: '' if row.get(name) is None else str(row.get(name)) for name in fieldnames}
+
+class CachedTable:
+    """Parsed rows of one CSV file together with the stat they were read at"""
+
+    def __init__(self, file_path: str, fieldnames: List[str], rows: List[Dict[str, str]],
+                 signature: Optional[Signature]):
+        self.file_path = file_path
+        self.fieldnames = fieldnames
+        self.rows = rows
+        self.signature = signature
+        # Indexes built from these rows; they are dropped with the table when the file is re-read
+        self.indexes: Dict[str, Any] = {}
+        # Serializes read-modify-write cycles on this file within the process
+        self.lock = threading.RLock()
+        # Set while the rows hold journaled changes that are not in the file yet
+        self.dirty = False
+        # (mtime_ns, size) of the CSV version the binary snapshot on disk describes
+        self.snapshot_source: Optional[Tuple[int, int]] = None
+
+    def get_index(self, name: str, factory: Callable[[], Any]) -> Any:
+        # Get a named index over the rows, building it on first use
+        index = self.indexes.get(name)
+        if index is None:
+            with self.lock:
+                index = self.indexes.get(name)
+                if index is None:
+                    index = factory()
+                    index.build(self.rows)
+                    self.indexes[name] = index
+        return index
+
+    def add_row(self, row: Dict[str, str]):
+        # Add a row and keep every index current
+        self.rows.append(row)
+        for index in self.indexes.values():
+            index.add(row)
+
+    def remove_row(self, row: Dict[str, str]):
+        # Remove a row (searching from the end, where recent inserts are) and keep every index current
+        for i in range(len(self.rows) - 1, -1, -1):
+            if self.rows[i] is row:
+                del self.rows[i]
+                break
+        for index in self.indexes.values():
+            index.remove(row)
+
+    def update_row(self, row: Dict[str, str], values: Dict[str, str]):
+        # Change a row in place and keep every index current; keyed indexes
+        # whose key did not change are left alone so the row keeps its position
+        updated = dict(row, **values)
+        affected = [index for index in self.indexes.values()
+                    if getattr(index, 'key_func', None) is None
+                    or index.key_func(row) != index.key_func(updated)]
+        for index in affected:
+            index.remove(row)
+        row.update(values)
+        for index in affected:
+            index.add(row)
+
+class TableCache:
+    """Keeps parsed CSV rows in memory and re-reads a file only when its stat changes"""
+
+    def __init__(self):
+        self._tables: Dict[str, CachedTable] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.snapshot_loads = 0
+
+    def get(self, file_path: str) -> Optional[CachedTable]:
+        # Get the cached table for a file, parsing it again if it changed on disk
+        key = os.path.abspath(file_path)
+        with self._lock:
+            signature = file_signature(key)
+            if signature is None and not getattr(self._tables.get(key), 'dirty', False):
+                self._tables.pop(key, None)
+                return None
+
+            table = self._tables.get(key)
+            if table is not None and (table.dirty or table.signature == signature):
+                # A dirty table is ahead of the file until the journal checkpoints it
+                self.hits += 1
+                return table
+
+            self.misses += 1
+            table = self._parse(key, signature)
+            self._tables[key] = table
+            return table
+
+    def store(self, file_path: str, fieldnames: List[str], rows: List[Dict[str, Any]]) -> CachedTable:
+        # Replace the cached table with rows that were just written to the file
+        key = os.path.abspath(file_path)
+        with self._lock:
+            table = CachedTable(key, list(fieldnames),
+                                [normalize_row(row, fieldnames) for row in rows],
+                                file_signature(key))
+            self._tables[key] = table
+            return table
+
+    def append(self, file_path: str, previous_signature: Optional[Signature],
+               row: Dict[str, Any]) -> Optional[CachedTable]:
+        # Add a row that was just appended to the file, if the cached copy was current
+        key = os.path.abspath(file_path)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None or table.signature != previous_signature:
+                self._tables.pop(key, None)
+                return None
+            table.add_row(normalize_row(row, table.fieldnames))
+            table.signature = file_signature(key)
+            return table
+
+    def refresh(self, table: CachedTable):
+        # Record that a cached table was just written back to its file as-is
+        with self._lock:
+            table.signature = file_signature(table.file_path)
+            self._tables[table.file_path] = table
+
+    def invalidate(self, file_path: Optional[str] = None):
+        # Drop one cached table, or all of them
+        with self._lock:
+            if file_path is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(os.path.abspath(file_path), None)
+
+    def reset_stats(self):
+        # Reset the hit/miss counters
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.snapshot_loads = 0
+
+    def get_statistics(self) -> Dict[str, int]:
+        # Get cache hit/miss statistics
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'snapshot_loads': self.snapshot_loads,
+                'tables': len(self._tables)
+            }
+
+    def save_snapshots(self):
+        # Write binary snapshots for cached tables whose snapshot is missing or stale
+        with self._lock:
+            tables = list(self._tables.values())
+        for table in tables:
+            with table.lock:
+                if table.dirty or table.signature is None:
+                    continue
+                source = table.signature[:2]
+                if table.snapshot_source != source and save_snapshot(
+                        table.file_path, source, table.fieldnames, table.rows):
+                    table.snapshot_source = source
+
+    def _parse(self, file_path: str, signature: Signature) -> CachedTable:
+        # Load a table from its binary snapshot when it matches the file, else parse the CSV
+        source = signature[:2]
+        snapshot = load_snapshot(file_path, source)
+        if snapshot is not None:
+            self.snapshot_loads += 1
+            fieldnames, rows = snapshot
+            table = CachedTable(file_path, fieldnames, rows, signature)
+            table.snapshot_source = source
+            return table
+
+        with open(file_path, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            rows = list(reader)
+            fieldnames = list(reader.fieldnames or [])
+        table = CachedTable(file_path, fieldnames, rows, signature)
+
+        # The CSV stays the source of truth; the snapshot only speeds up the next cold start
+        if save_snapshot(file_path, source, fieldnames, rows):
+            table.snapshot_source = source
+        return table
+
+# Shared by every repository instance in the process
+table_cache = TableCache()
+
+# Refresh snapshots on the way out so the next launch can skip CSV parsing
+atexit.register(table_cache.save_snapshots)
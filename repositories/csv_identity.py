@@ -0,0 +1,58 @@
+"""
+Identity map for model objects built from cached CSV rows
+"""
+
+import threading
+from dataclasses import fields
+from typing import Any, Callable, Dict, List, Optional
+
+class IdentityMap:
+    """Hands out one model instance per primary key"""
+
+    # Each entry keeps the row values the instance was built from. When the row
+    # has changed since (an update, a rolled-back transaction, a reload from
+    # disk), the same instance is refreshed in place, so every holder of it sees
+    # the new values. An unchanged row costs a tuple comparison instead of
+    # building a model.
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # key -> [row values the model reflects (None once invalidated), model]
+        self._entries: Dict[Any, List[Any]] = {}
+
+    def resolve(self, key: Any, row: Dict[str, str], build: Callable[[Dict[str, str]], Any]) -> Any:
+        # The instance for key, built from row on first use and refreshed when row changed
+        snapshot = tuple(row.values())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                model = build(row)
+                self._entries[key] = [snapshot, model]
+                return model
+            if entry[0] != snapshot:
+                fresh = build(row)
+                model = entry[1]
+                for field in fields(model):
+                    setattr(model, field.name, getattr(fresh, field.name))
+                entry[0] = snapshot
+            return entry[1]
+
+    def invalidate(self, key: Any):
+        # Re-read the instance from its row on next use, e.g. after it was written
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[0] = None
+
+    def get(self, key: Any) -> Optional[Any]:
+        # The instance already handed out for key, if any
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,86 @@
+"""
+Persistent ID sequences for CSV tables
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+class IdAllocator:
+    """Hands out monotonically increasing IDs for one CSV table"""
+
+    def __init__(self, file_path: str, seed: Callable[[], int]):
+        # The next free ID lives in a sidecar next to the CSV (e.g. data/.pledges.csv.seq),
+        # guarded by a thread lock plus an flock on the sidecar's .lock file where available
+        directory, name = os.path.split(os.path.abspath(file_path))
+        self.seq_path = os.path.join(directory, f".{name}.seq")
+        self.lock_path = self.seq_path + ".lock"
+        # Returns the largest ID currently in the table (0 when empty)
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._checked = False
+
+    def next_id(self) -> int:
+        # Allocate a single ID
+        return self.reserve(1).start
+
+    def reserve(self, count: int) -> range:
+        # Allocate a contiguous block of IDs, e.g. for a bulk import
+        if count < 1:
+            raise ValueError("count must be at least 1")
+
+        with self._lock, self._file_lock():
+            next_id = self._read_sequence()
+            if next_id is None or not self._checked:
+                # First use in this process, or no sidecar yet: make sure the
+                # sequence is ahead of every ID already in the table
+                next_id = max(next_id or 1, self.seed() + 1)
+                self._checked = True
+            self._write_sequence(next_id + count)
+            return range(next_id, next_id + count)
+
+    def _read_sequence(self):
+        try:
+            with open(self.seq_path, 'r', encoding='utf-8') as file:
+                return int(file.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_sequence(self, next_id: int):
+        # Write to a temporary file and rename it so readers never see a torn value
+        tmp_path = self.seq_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            file.write(str(next_id))
+        os.replace(tmp_path, self.seq_path)
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+_allocators: Dict[str, IdAllocator] = {}
+_allocators_lock = threading.Lock()
+
+def get_allocator(file_path: str, seed: Callable[[], int]) -> IdAllocator:
+    # Get the process-wide allocator for a CSV file
+    key = os.path.abspath(file_path)
+    with _allocators_lock:
+        allocator = _allocators.get(key)
+        if allocator is None:
+            allocator = IdAllocator(key, seed)
+            _allocators[key] = allocator
+        return allocator
@@ -0,0 +1,145 @@
+"""
+In-memory indexes over cached CSV rows
+"""
+
+import bisect
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+class UniqueIndex:
+    """Maps a key to the single row holding it"""
+
+    def __init__(self, key_func: Callable[[Dict[str, str]], Any]):
+        self.key_func = key_func
+        self.rows: Dict[Any, Dict[str, str]] = {}
+
+    def build(self, rows: Iterable[Dict[str, str]]):
+        # Index every row; the first row wins when a key repeats, like a linear scan would
+        self.rows = {}
+        for row in rows:
+            self.rows.setdefault(self.key_func(row), row)
+
+    def add(self, row: Dict[str, str]):
+        self.rows.setdefault(self.key_func(row), row)
+
+    def remove(self, row: Dict[str, str]):
+        key = self.key_func(row)
+        if self.rows.get(key) is row:
+            del self.rows[key]
+
+    def get(self, key: Any) -> Optional[Dict[str, str]]:
+        return self.rows.get(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+class MultiIndex:
+    """Maps a key to every row holding it, in file order"""
+
+    def __init__(self, key_func: Callable[[Dict[str, str]], Any]):
+        self.key_func = key_func
+        self.rows: Dict[Any, List[Dict[str, str]]] = {}
+
+    def build(self, rows: Iterable[Dict[str, str]]):
+        self.rows = {}
+        for row in rows:
+            self.rows.setdefault(self.key_func(row), []).append(row)
+
+    def add(self, row: Dict[str, str]):
+        self.rows.setdefault(self.key_func(row), []).append(row)
+
+    def remove(self, row: Dict[str, str]):
+        key = self.key_func(row)
+        bucket = self.rows.get(key)
+        if bucket is None:
+            return
+        for i, candidate in enumerate(bucket):
+            if candidate is row:
+                del bucket[i]
+                break
+        if not bucket:
+            del self.rows[key]
+
+    def get(self, key: Any) -> List[Dict[str, str]]:
+        return self.rows.get(key, [])
+
+    def count(self, key: Any) -> int:
+        return len(self.rows.get(key, ()))
+
+class CountIndex:
+    """Keeps the number of rows per key, plus the total, without holding the rows"""
+
+    def __init__(self, key_func: Callable[[Dict[str, str]], Any]):
+        self.key_func = key_func
+        self.counts: Dict[Any, int] = {}
+        self.total = 0
+
+    def build(self, rows: Iterable[Dict[str, str]]):
+        # Seed the counters with one pass over the rows
+        self.counts = {}
+        self.total = 0
+        for row in rows:
+            self.add(row)
+
+    def add(self, row: Dict[str, str]):
+        key = self.key_func(row)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.total += 1
+
+    def remove(self, row: Dict[str, str]):
+        key = self.key_func(row)
+        remaining = self.counts.get(key, 0) - 1
+        if remaining > 0:
+            self.counts[key] = remaining
+        else:
+            self.counts.pop(key, None)
+        self.total -= 1
+
+    def count(self, key: Any) -> int:
+        return self.counts.get(key, 0)
+
+class SortedIndex:
+    """Keeps rows ordered by a key, repositioning a row when its key changes"""
+
+    # Rows are placed with bisect, so an insert or reposition is a binary search
+    # plus one list insert/delete, and reading the first N rows needs no sorting.
+    # Rows with equal keys keep the order they were added in.
+
+    def __init__(self, key_func: Callable[[Dict[str, str]], Any]):
+        self.key_func = key_func
+        self.keys: List[Any] = []
+        self.rows: List[Dict[str, str]] = []
+
+    def build(self, rows: Iterable[Dict[str, str]]):
+        # sorted() is stable, matching what repeated add() calls would produce
+        pairs = sorted(((self.key_func(row), row) for row in rows), key=lambda pair: pair[0])
+        self.keys = [key for key, _ in pairs]
+        self.rows = [row for _, row in pairs]
+
+    def add(self, row: Dict[str, str]):
+        key = self.key_func(row)
+        position = bisect.bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.rows.insert(position, row)
+
+    def remove(self, row: Dict[str, str]):
+        key = self.key_func(row)
+        position = bisect.bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            if self.rows[position] is row:
+                del self.keys[position]
+                del self.rows[position]
+                return
+            position += 1
+
+    def first(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        # The first rows in key order (all of them when limit is None)
+        return self.rows[:limit]
+
+    def __iter__(self):
+        return iter(list(self.rows))
+
+    def __len__(self) -> int:
+        return len(self.rows)
@@ -0,0 +1,368 @@
+"""
+Write-ahead journal for multi-file CSV transactions
+"""
+
+import atexit
+import csv
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from repositories.csv_cache import CachedTable, file_signature, missing_final_newline, table_cache
+from repositories.csv_indexes import UniqueIndex
+
+class JournalError(Exception):
+    """Raised when a transaction could not be made durable"""
+
+class Transaction:
+    """Changes made to cached tables inside one journal transaction"""
+
+    def __init__(self, journal: 'Journal'):
+        self.journal = journal
+        self.ops: List[Dict[str, Any]] = []
+        # (table, row, previous values or None for an inserted row), used to roll back
+        self.undo: List[Tuple[CachedTable, Dict[str, str], Optional[Dict[str, str]]]] = []
+
+    def insert(self, table: CachedTable, csv_file: str, row: Dict[str, str]):
+        # Add a row to the in-memory table and log it
+        with table.lock:
+            table.add_row(row)
+            table.dirty = True
+        self.undo.append((table, row, None))
+        self.ops.append({'op': 'insert', 'table': csv_file, 'row': dict(row)})
+        self.journal._mark_inserted(table, row)
+
+    def update(self, table: CachedTable, csv_file: str, row: Dict[str, str], values: Dict[str, str]):
+        # Change a row of the in-memory table and log the new values
+        with table.lock:
+            previous = {name: row.get(name, '') for name in values}
+            table.update_row(row, values)
+            table.dirty = True
+        self.undo.append((table, row, previous))
+        self.ops.append({'op': 'update', 'table': csv_file, 'id': row['id'], 'values': dict(values)})
+        self.journal._mark_updated(table)
+
+    def rollback(self):
+        # Undo the in-memory changes in reverse order
+        for table, row, previous in reversed(self.undo):
+            with table.lock:
+                if previous is None:
+                    table.remove_row(row)
+                    self.journal._forget_inserted(table, row)
+                else:
+                    table.update_row(row, previous)
+        self.undo = []
+        self.ops = []
+
+class _DirtyTable:
+    """A cached table whose journaled changes have not reached its CSV yet"""
+
+    def __init__(self, table: CachedTable):
+        self.table = table
+        # Rows inserted since the last checkpoint; appended to the file if nothing else changed
+        self.appended: List[Dict[str, str]] = []
+        self.rewrite = False
+
+class Journal:
+    """Append-only log of pledge transactions with group commit and background checkpoints"""
+
+    # Checkpoint once this many records are waiting, or after this many seconds
+    CHECKPOINT_RECORDS = 256
+    CHECKPOINT_INTERVAL = 2.0
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, "journal.log")
+        self._local = threading.local()
+
+        # Serializes the in-memory apply phase of transactions
+        self._apply_lock = threading.RLock()
+
+        # Group commit state
+        self._commit_cond = threading.Condition()
+        self._pending: List[str] = []
+        self._next_lsn = 1
+        self._durable_lsn = 0
+        self._failed: Dict[int, Exception] = {}
+        self._flushing = False
+        self._records_since_checkpoint = 0
+
+        # Transactions in flight vs. a checkpoint in progress
+        self._gate = threading.Condition()
+        self._active = 0
+        self._checkpointing = False
+
+        # Transactions change cached tables in memory and log one JSON record to
+        # data/journal.log; a background checkpoint later brings the CSVs up to date
+        self._dirty: Dict[str, _DirtyTable] = {}
+        self._dirty_lock = threading.Lock()
+
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._checkpointer: Optional[threading.Thread] = None
+
+    # Transactions
+
+    def current_transaction(self) -> Optional[Transaction]:
+        # Get the transaction open on this thread, if any
+        return getattr(self._local, 'transaction', None)
+
+    @contextmanager
+    def transaction(self):
+        # Run the enclosed repository writes as one durable journal record
+        if self.current_transaction() is not None:
+            # Nested use joins the outer transaction
+            yield self.current_transaction()
+            return
+
+        with self._gate:
+            while self._checkpointing:
+                self._gate.wait()
+            self._active += 1
+
+        txn = Transaction(self)
+        try:
+            with self._apply_lock:
+                self._local.transaction = txn
+                try:
+                    yield txn
+                except BaseException:
+                    txn.rollback()
+                    raise
+                finally:
+                    self._local.transaction = None
+                lsn = self._enqueue(txn) if txn.ops else None
+
+            if lsn is not None:
+                try:
+                    self._wait_durable(lsn)
+                except JournalError:
+                    with self._apply_lock:
+                        txn.rollback()
+                    raise
+        finally:
+            with self._gate:
+                self._active -= 1
+                self._gate.notify_all()
+
+        if self._records_since_checkpoint >= self.CHECKPOINT_RECORDS:
+            self._wakeup.set()
+
+    def _enqueue(self, txn: Transaction) -> int:
+        # Assign a log sequence number and queue the record for the next group commit
+        with self._commit_cond:
+            lsn = self._next_lsn
+            self._next_lsn += 1
+            record = {'lsn': lsn, 'ops': txn.ops}
+            self._pending.append(json.dumps(record, separators=(',', ':')) + '\n')
+            return lsn
+
+    def _wait_durable(self, lsn: int):
+        # Block until the record is fsynced; whoever finds no flush running writes the whole batch
+        with self._commit_cond:
+            while self._durable_lsn < lsn and lsn not in self._failed:
+                if self._flushing:
+                    self._commit_cond.wait()
+                    continue
+
+                self._flushing = True
+                batch = self._pending
+                self._pending = []
+                upto = self._next_lsn - 1
+                self._commit_cond.release()
+                error = None
+                try:
+                    with open(self.path, 'a', encoding='utf-8') as file:
+                        file.writelines(batch)
+                        file.flush()
+                        os.fsync(file.fileno())
+                except OSError as e:
+                    error = e
+                finally:
+                    self._commit_cond.acquire()
+                    self._flushing = False
+
+                if error is None:
+                    self._durable_lsn = upto
+                    self._records_since_checkpoint += len(batch)
+                else:
+                    for failed_lsn in range(self._durable_lsn + 1, upto + 1):
+                        self._failed[failed_lsn] = error
+                self._commit_cond.notify_all()
+
+            error = self._failed.pop(lsn, None)
+            if error is not None:
+                raise JournalError(f"Could not write journal: {error}")
+
+    def _dirty_entry(self, table: CachedTable) -> _DirtyTable:
+        entry = self._dirty.get(table.file_path)
+        if entry is None or entry.table is not table:
+            entry = _DirtyTable(table)
+            self._dirty[table.file_path] = entry
+        return entry
+
+    def _mark_inserted(self, table: CachedTable, row: Dict[str, str]):
+        with self._dirty_lock:
+            self._dirty_entry(table).appended.append(row)
+
+    def _mark_updated(self, table: CachedTable):
+        with self._dirty_lock:
+            self._dirty_entry(table).rewrite = True
+
+    def _forget_inserted(self, table: CachedTable, row: Dict[str, str]):
+        with self._dirty_lock:
+            entry = self._dirty.get(table.file_path)
+            if entry is not None:
+                entry.appended = [r for r in entry.appended if r is not row]
+
+    # Checkpoints
+
+    def checkpoint(self):
+        # Write every table changed since the last checkpoint back to its CSV and empty the log
+        with self._gate:
+            while self._checkpointing:
+                self._gate.wait()
+            self._checkpointing = True
+            while self._active:
+                self._gate.wait()
+
+        try:
+            # Entries leave _dirty only once their table is written, so a failed
+            # checkpoint is retried in full by the next one
+            with self._dirty_lock:
+                dirty = list(self._dirty.values())
+            for entry in dirty:
+                try:
+                    self._write_table(entry)
+                except BaseException:
+                    # The file may be half written; only a full rewrite is safe now
+                    entry.rewrite = True
+                    raise
+                with self._dirty_lock:
+                    if self._dirty.get(entry.table.file_path) is entry:
+                        del self._dirty[entry.table.file_path]
+            if dirty or os.path.exists(self.path):
+                with open(self.path, 'w', encoding='utf-8') as file:
+                    file.flush()
+                    os.fsync(file.fileno())
+            with self._commit_cond:
+                self._records_since_checkpoint = 0
+        finally:
+            with self._gate:
+                self._checkpointing = False
+                self._gate.notify_all()
+
+    def _write_table(self, entry: _DirtyTable):
+        # Bring one CSV up to date: append new rows when that is all that changed,
+        # otherwise replace the file atomically with the cached rows
+        table = entry.table
+        with table.lock:
+            on_disk = file_signature(table.file_path)
+            if not entry.rewrite and on_disk is not None and on_disk == table.signature:
+                # Same guard as CSVRepository._append_csv: never glue the first
+                # appended row onto a last line saved without a terminator
+                needs_newline = missing_final_newline(table.file_path)
+                with open(table.file_path, 'a', newline='', encoding='utf-8') as file:
+                    if needs_newline:
+                        file.write('\r\n')
+                    writer = csv.DictWriter(file, fieldnames=table.fieldnames, extrasaction='ignore')
+                    writer.writerows(entry.appended)
+                    file.flush()
+                    os.fsync(file.fileno())
+            else:
+                tmp_path = table.file_path + ".tmp"
+                with open(tmp_path, 'w', newline='', encoding='utf-8') as file:
+                    writer = csv.DictWriter(file, fieldnames=table.fieldnames, extrasaction='ignore')
+                    writer.writeheader()
+                    writer.writerows(table.rows)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(tmp_path, table.file_path)
+            table.dirty = False
+            table_cache.refresh(table)
+
+    def start(self):
+        # Start the background checkpoint thread
+        if self._checkpointer is None:
+            self._checkpointer = threading.Thread(target=self._run_checkpointer,
+                                                  name="journal-checkpoint", daemon=True)
+            self._checkpointer.start()
+
+    def close(self):
+        # Stop the background thread and write a final checkpoint
+        self._stopped = True
+        self._wakeup.set()
+        self.checkpoint()
+
+    def _run_checkpointer(self):
+        while not self._stopped:
+            self._wakeup.wait(self.CHECKPOINT_INTERVAL)
+            self._wakeup.clear()
+            if self._dirty:
+                try:
+                    self.checkpoint()
+                except OSError as e:
+                    print(f"Journal checkpoint failed: {str(e)}")
+
+    # Recovery
+
+    def recover(self) -> int:
+        # Replay records left in the log by a crash, then checkpoint them; returns the count
+        if not os.path.exists(self.path):
+            return 0
+
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final write was never acknowledged; stop there
+                    break
+
+        for record in records:
+            for op in record.get('ops', []):
+                self._replay(op)
+        if records:
+            self._next_lsn = max(record.get('lsn', 0) for record in records) + 1
+            self._durable_lsn = self._next_lsn - 1
+        self.checkpoint()
+        return len(records)
+
+    def _replay(self, op: Dict[str, Any]):
+        # Apply one logged change; both operations are idempotent
+        table = table_cache.get(os.path.join(self.data_dir, op['table']))
+        if table is None:
+            return
+        by_id = table.get_index('row_id', lambda: UniqueIndex(lambda row: row['id']))
+        with table.lock:
+            if op['op'] == 'insert':
+                if op['row']['id'] not in by_id:
+                    row = {name: op['row'].get(name, '') for name in table.fieldnames}
+                    table.add_row(row)
+                    table.dirty = True
+                    self._mark_inserted(table, row)
+            elif op['op'] == 'update':
+                row = by_id.get(op['id'])
+                if row is not None:
+                    table.update_row(row, op['values'])
+                    table.dirty = True
+                    self._mark_updated(table)
+
+_journals: Dict[str, Journal] = {}
+_journals_lock = threading.Lock()
+
+def get_journal(data_dir: str) -> Journal:
+    # Get the process-wide journal for a data directory, replaying it on first use
+    key = os.path.abspath(data_dir)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = Journal(key)
+            journal.recover()
+            journal.start()
+            atexit.register(journal.close)
+            _journals[key] = journal
+        return journal
@@ -0,0 +1,175 @@
+"""
+Memory-mapped CSV access with lazy row materialization
+"""
+
+import csv
+import mmap
+import os
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from repositories.csv_cache import Signature, file_signature
+
+class MappedCSV:
+    """Memory-mapped CSV file with a compact array of row byte offsets"""
+
+    # Rows are located by line breaks, so this is only for files whose values never
+    # contain newlines (true of pledges.csv: numbers, IDs, status and timestamps).
+    # Memory use is the offsets array (8 bytes per row) plus whatever the OS keeps
+    # of the mapping in its page cache; no row is parsed until it is requested.
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.fieldnames: List[str] = []
+        self._lock = threading.RLock()
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._signature: Optional[Signature] = None
+        # Last bytes of the mapped data, used to tell an append from a rewrite
+        self._tail = b''
+        # offsets[i] is where row i starts; a final entry marks the end of the last row
+        self._offsets = array('Q')
+        # Lazily built column -> value -> row numbers, and how many rows each covers
+        self._positions: Dict[str, Dict[str, array]] = {}
+        self._indexed: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        self.refresh()
+        return max(len(self._offsets) - 1, 0)
+
+    def refresh(self):
+        # Remap the file if it changed; appended rows are indexed incrementally
+        with self._lock:
+            signature = file_signature(self.file_path)
+            if signature == self._signature:
+                return
+
+            previous_end = self._offsets[-1] if self._offsets else 0
+            appended_only = (self._signature is not None and signature is not None
+                             and signature[2] == self._signature[2] and signature[1] >= self._signature[1])
+            self._close()
+            self._signature = signature
+            if signature is None or signature[1] == 0:
+                self.fieldnames = []
+                self._offsets = array('Q')
+                self._positions = {}
+                self._indexed = {}
+                return
+
+            self._file = open(self.file_path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if appended_only and self._offsets:
+                # Same inode and not shorter: treat as an append only if the old last row is intact
+                appended_only = self._map[previous_end - len(self._tail):previous_end] == self._tail
+            if appended_only and self._offsets:
+                # Column indexes catch up with the new rows the next time they are used
+                self._offsets.pop()
+                self._scan(previous_end)
+            else:
+                header_end = self._map.find(b'\n') + 1 or len(self._map)
+                header = self._map[:header_end].decode('utf-8')
+                self.fieldnames = next(csv.reader([header]), [])
+                self._offsets = array('Q')
+                self._positions = {}
+                self._indexed = {}
+                self._scan(header_end)
+            end = self._offsets[-1]
+            self._tail = self._map[max(end - 64, 0):end]
+
+    def _scan(self, start: int):
+        # Record the start of every line from start to the end of the mapping
+        mapped = self._map
+        size = len(mapped)
+        offsets = self._offsets
+        position = start
+        while position < size:
+            offsets.append(position)
+            end = mapped.find(b'\n', position)
+            if end == -1:
+                position = size
+                break
+            position = end + 1
+        offsets.append(position)
+        # Drop blank lines (e.g. a trailing empty line)
+        if len(offsets) >= 2 and not mapped[offsets[-2]:offsets[-1]].strip():
+            del offsets[-2]
+
+    def _raw(self, position: int) -> bytes:
+        return self._map[self._offsets[position]:self._offsets[position + 1]]
+
+    def row(self, position: int) -> Dict[str, str]:
+        # Parse a single row by its position in the file
+        self.refresh()
+        return self._row(position)
+
+    def rows(self, positions: Iterable[int]) -> Iterator[Dict[str, str]]:
+        # Parse the rows at the given positions, one at a time; the file is checked
+        # for changes once per batch, not once per row
+        self.refresh()
+        for position in positions:
+            yield self._row(position)
+
+    def _row(self, position: int) -> Dict[str, str]:
+        with self._lock:
+            if position < 0:
+                position += len(self._offsets) - 1
+            if not 0 <= position < len(self._offsets) - 1:
+                raise IndexError("row position out of range")
+            raw = self._raw(position)
+        return dict(zip(self.fieldnames, self._values(raw)))
+
+    @staticmethod
+    def _values(raw: bytes) -> List[str]:
+        # Split a raw line; only quoted lines need the csv module
+        if b'"' in raw:
+            return next(csv.reader([raw.decode('utf-8')]), [])
+        return raw.rstrip(b'\r\n').decode('utf-8').split(',')
+
+    def positions(self, column: str, value: str) -> array:
+        # Row positions whose column equals value, via an index built on first use
+        with self._lock:
+            self.refresh()
+            index = self._positions.setdefault(column, {})
+            indexed = self._indexed.get(column, 0)
+            row_count = len(self._offsets) - 1
+            if indexed < row_count:
+                self._index_rows(index, column, range(indexed, row_count))
+                self._indexed[column] = row_count
+            return array('L', index.get(value, ()))
+
+    def _index_rows(self, index: Dict[str, array], column: str, positions: Iterable[int]):
+        slot = self.fieldnames.index(column)
+        for position in positions:
+            values = self._values(self._raw(position))
+            if slot < len(values):
+                index.setdefault(values[slot], array('L')).append(position)
+
+    def _close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+            self._signature = None
+            self._offsets = array('Q')
+            self._positions = {}
+            self._indexed = {}
+
+_mapped: Dict[str, MappedCSV] = {}
+_mapped_lock = threading.Lock()
+
+def get_mapped(file_path: str) -> MappedCSV:
+    # Get the process-wide mapping of a CSV file
+    key = os.path.abspath(file_path)
+    with _mapped_lock:
+        mapped = _mapped.get(key)
+        if mapped is None:
+            mapped = MappedCSV(key)
+            _mapped[key] = mapped
+        return mapped
@@ -4,29 +4,41 @@ CSV-based repositories for data access
 
 import csv
 import os
-from typing import List, Optional, Dict, Any
-from datetime import date, datetime
+from typing import Callable, Iterator, List, Optional, Dict, Any, Set, Union
+from datetime import date, datetime, timedelta
+from models.csv_decoding import decode_date, decode_datetime
 from models.csv_models import User, Category, Project, RewardTier, Pledge, PledgeStatus
+from repositories.csv_aggregates import FundingLeaderboard, ProjectPledgeStats
+from repositories.csv_cache import CachedTable, missing_final_newline, normalize_row, table_cache
+from repositories.csv_identity import IdentityMap
+from repositories.csv_ids import IdAllocator, get_allocator
+from repositories.csv_indexes import CountIndex, MultiIndex, SortedIndex, UniqueIndex
+from repositories.csv_journal import Journal, get_journal
+from repositories.csv_search import ProjectSearchIndex
+from repositories.csv_mmap import MappedCSV, get_mapped
 
 class CSVRepository:
     """Base class for CSV-based repositories"""
     
+    # Column order used when the file has to be written from scratch
+    fieldnames: List[str] = []
+    
     def __init__(self, csv_file: str):
         self.csv_file = csv_file
         self.data_dir = "data"
         self.file_path = os.path.join(self.data_dir, csv_file)
     
     def _read_csv(self) -> List[Dict[str, Any]]:
-        # Read data from CSV file
-        if not os.path.exists(self.file_path):
+        # Read data from CSV file (served from the shared table cache)
+        table = self._load_table()
+        if table is None:
             return []
-        
-        data = []
-        with open(self.file_path, 'r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                data.append(row)
-        return data
+        # Copy the list so callers can append/replace rows without touching the cache
+        return list(table.rows)
+    
+    def _load_table(self) -> Optional[CachedTable]:
+        # Get the cached table for this file, or None if the file does not exist
+        return table_cache.get(self.file_path)
     
     def _write_csv(self, data: List[Dict[str, Any]], fieldnames: List[str]):
         # Write data to CSV file
@@ -36,261 +48,437 @@ class CSVRepository:
             writer = csv.DictWriter(file, fieldnames=fieldnames)
             writer.writeheader()
             writer.writerows(data)
-    
-    def _get_next_id(self, data: List[Dict[str, Any]]) -> int:
-        # Get next available ID
-        if not data:
-            return 1
-        max_id = max(int(row.get('id', 0)) for row in data)
-        return max_id + 1
+        
+        # Keep the cache in step with what was just written
+        table_cache.store(self.file_path, fieldnames, data)
+    
+    def journal(self) -> Journal:
+        # Get the write-ahead journal of this repository's data directory
+        return get_journal(self.data_dir)
+    
+    def transaction(self):
+        # Group writes across repositories into one journaled, all-or-nothing change
+        return self.journal().transaction()
+    
+    def _append_csv(self, row: Dict[str, Any], fieldnames: List[str]):
+        # Append a single row to CSV file without rewriting the existing rows
+        journal = self.journal()
+        txn = journal.current_transaction()
+        table = self._load_table()
+        if table is None or not table.fieldnames:
+            # Missing or empty file: write it fresh so the header is included
+            self._write_csv([] if txn else [row], fieldnames)
+            if not txn:
+                return
+            table = self._load_table()
+        
+        with table.lock:
+            if txn is not None:
+                # Applied in memory now; the journal checkpoint appends it to the file
+                txn.insert(table, self.csv_file, normalize_row(row, table.fieldnames))
+                return
+            
+            if not table.dirty:
+                # Guard against a last line that was saved without a line terminator
+                needs_newline = missing_final_newline(self.file_path)
+                
+                with open(self.file_path, 'a', newline='', encoding='utf-8') as file:
+                    if needs_newline:
+                        file.write('\r\n')
+                    # Follow the column order of the existing header
+                    writer = csv.DictWriter(file, fieldnames=table.fieldnames, extrasaction='ignore')
+                    writer.writerow(row)
+                
+                table_cache.append(self.file_path, table.signature, row)
+                return
+        
+        # The file is behind journaled changes; log this write after them
+        with journal.transaction():
+            self._append_csv(row, fieldnames)
+    
+    def _update_row(self, key: Any,
+                    values: Union[Dict[str, Any], Callable[[Dict[str, str]], Optional[Dict[str, Any]]]]) -> bool:
+        # Update the row with the given primary key in place and rewrite the file.
+        # values may be a function of the current row, evaluated under the table lock;
+        # returning None from it leaves the row unchanged.
+        journal = self.journal()
+        txn = journal.current_transaction()
+        table = self._load_table()
+        if table is None:
+            return False
+        
+        with table.lock:
+            if txn is not None or not table.dirty:
+                row = self._primary_index(table).get(key)
+                if row is None:
+                    return False
+                new_values = values(row) if callable(values) else values
+                if new_values is None:
+                    return False
+                new_values = normalize_row(new_values, list(new_values))
+                
+                if txn is not None:
+                    # Applied in memory now; the journal checkpoint rewrites the file
+                    txn.update(table, self.csv_file, row, new_values)
+                    return True
+                
+                table.update_row(row, new_values)
+                with open(self.file_path, 'w', newline='', encoding='utf-8') as file:
+                    writer = csv.DictWriter(file, fieldnames=table.fieldnames, extrasaction='ignore')
+                    writer.writeheader()
+                    writer.writerows(table.rows)
+                
+                table_cache.refresh(table)
+                return True
+        
+        # The file is behind journaled changes; log this write after them
+        with journal.transaction():
+            return self._update_row(key, values)
+    
+    def _next_id(self) -> int:
+        # Get next available ID from the table's persistent sequence
+        return self._id_allocator().next_id()
+    
+    def reserve_ids(self, count: int) -> range:
+        # Reserve a block of IDs in one step, e.g. for bulk imports
+        return self._id_allocator().reserve(count)
+    
+    def _id_allocator(self) -> IdAllocator:
+        return get_allocator(self.file_path, self._max_id)
+    
+    def _max_id(self) -> int:
+        # Largest ID in the table; only used to seed or sanity-check the sequence
+        table = self._load_table()
+        if table is None or not table.rows:
+            return 0
+        return max(int(row.get('id') or 0) for row in table.rows)
+    
+    def _primary_key(self, row: Dict[str, str]) -> Any:
+        # Key used by the primary-key index; integer IDs unless a subclass says otherwise
+        return int(row['id'])
+    
+    def _primary_index(self, table: CachedTable) -> UniqueIndex:
+        # Get the primary-key index of a loaded table
+        return table.get_index('pk', lambda: UniqueIndex(self._primary_key))
+    
+    def _find_by_key(self, key: Any) -> Optional[Dict[str, str]]:
+        # Find a row by primary key in O(1)
+        table = self._load_table()
+        if table is None:
+            return None
+        return self._primary_index(table).get(key)
+    
+    def _find_all_by(self, index_name: str, key_func: Callable[[Dict[str, str]], Any],
+                     key: Any) -> List[Dict[str, str]]:
+        # Find every row with the given key through a secondary index
+        table = self._load_table()
+        if table is None:
+            return []
+        index = table.get_index(index_name, lambda: MultiIndex(key_func))
+        return list(index.get(key))
+    
+    def _to_model(self, row: Dict[str, str]) -> Any:
+        # Build a model object from a CSV row
+        raise NotImplementedError
+    
+    def _iter_rows(self) -> Iterator[Dict[str, str]]:
+        # Yield the raw rows of the table in file order
+        table = self._load_table()
+        if table is None:
+            return
+        with table.lock:
+            # A shallow copy of the row list, so writes during iteration cannot skip rows
+            rows = table.rows[:]
+        yield from rows
+    
+    def iter_all(self) -> Iterator[Any]:
+        # Yield every record as a model object, building one at a time
+        return map(self._to_model, self._iter_rows())
+    
+    def iter_where(self, predicate: Callable[[Any], bool]) -> Iterator[Any]:
+        # Yield the model objects for which predicate returns True
+        return filter(predicate, self.iter_all())
+
 
 class UserRepository(CSVRepository):
+    fieldnames = ['id', 'username', 'email', 'password_hash', 'created_at']
+    
     def __init__(self):
         super().__init__("users.csv")
     
+    @staticmethod
+    def _normalize(value: str) -> str:
+        # Usernames and emails are unique regardless of case and surrounding spaces
+        return value.strip().casefold()
+    
+    def _unique_index(self, table: CachedTable, column: str) -> UniqueIndex:
+        # Get the case-normalized unique index on username or email
+        return table.get_index(column, lambda: UniqueIndex(lambda row: self._normalize(row[column])))
+    
+    def _find_unique(self, column: str, value: str) -> Optional[Dict[str, str]]:
+        table = self._load_table()
+        if table is None:
+            return None
+        return self._unique_index(table, column).get(self._normalize(value))
+    
+    def _to_model(self, row: Dict[str, str]) -> User:
+        return User(
+            id=int(row['id']),
+            username=row['username'],
+            email=row['email'],
+            password_hash=row['password_hash'],
+            created_at=row['created_at']
+        )
+    
     def create(self, user: User) -> User:
-        # Create a new user
-        data = self._read_csv()
-        user.id = self._get_next_id(data)
-        
-        user_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'password_hash': user.password_hash,
-            'created_at': user.created_at.isoformat()
-        }
-        data.append(user_data)
-        
-        self._write_csv(data, ['id', 'username', 'email', 'password_hash', 'created_at'])
-        return user
+        # Create a new user. Duplicate usernames/emails are rejected here, inside a
+        # journal transaction, so concurrent registrations cannot both pass the checks;
+        # a burst of sign-ups also shares journal fsyncs through group commit.
+        with self.transaction():
+            table = self._load_table()
+            if table is not None:
+                if self._normalize(user.username) in self._unique_index(table, 'username'):
+                    raise ValueError("Username already exists")
+                if self._normalize(user.email) in self._unique_index(table, 'email'):
+                    raise ValueError("Email already exists")
+            
+            user.id = self._next_id()
+            
+            user_data = {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'password_hash': user.password_hash,
+                'created_at': user.created_at.isoformat()
+            }
+            
+            self._append_csv(user_data, self.fieldnames)
+            return user
     
     def get_by_id(self, user_id: int) -> Optional[User]:
         # Get user by ID
-        data = self._read_csv()
-        for row in data:
-            if int(row['id']) == user_id:
-                return User(
-                    id=int(row['id']),
-                    username=row['username'],
-                    email=row['email'],
-                    password_hash=row['password_hash'],
-                    created_at=row['created_at']
-                )
-        return None
+        row = self._find_by_key(user_id)
+        return self._to_model(row) if row else None
     
     def get_by_username(self, username: str) -> Optional[User]:
-        # Get user by username
-        data = self._read_csv()
-        for row in data:
-            if row['username'] == username:
-                return User(
-                    id=int(row['id']),
-                    username=row['username'],
-                    email=row['email'],
-                    password_hash=row['password_hash'],
-                    created_at=row['created_at']
-                )
-        return None
+        # Get user by username (case-insensitive)
+        row = self._find_unique('username', username)
+        return self._to_model(row) if row else None
     
     def get_by_email(self, email: str) -> Optional[User]:
-        # Get user by email
-        data = self._read_csv()
-        for row in data:
-            if row['email'] == email:
-                return User(
-                    id=int(row['id']),
-                    username=row['username'],
-                    email=row['email'],
-                    password_hash=row['password_hash'],
-                    created_at=row['created_at']
-                )
-        return None
+        # Get user by email (case-insensitive)
+        row = self._find_unique('email', email)
+        return self._to_model(row) if row else None
+    
+    def username_exists(self, username: str) -> bool:
+        # Check whether a username is taken without building a User
+        return self._find_unique('username', username) is not None
+    
+    def email_exists(self, email: str) -> bool:
+        # Check whether an email is taken without building a User
+        return self._find_unique('email', email) is not None
     
     def get_all(self) -> List[User]:
         # Get all users
-        data = self._read_csv()
-        users = []
-        for row in data:
-            users.append(User(
-                id=int(row['id']),
-                username=row['username'],
-                email=row['email'],
-                password_hash=row['password_hash'],
-                created_at=row['created_at']
-            ))
-        return users
+        return list(self.iter_all())
     
     def update(self, user: User) -> User:
         # Update user
-        data = self._read_csv()
-        for i, row in enumerate(data):
-            if int(row['id']) == user.id:
-                data[i] = {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email,
-                    'password_hash': user.password_hash,
-                    'created_at': user.created_at.isoformat()
-                }
-                break
-        
-        self._write_csv(data, ['id', 'username', 'email', 'password_hash', 'created_at'])
+        self._update_row(user.id, {
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'password_hash': user.password_hash,
+            'created_at': user.created_at.isoformat()
+        })
         return user
 
 class CategoryRepository(CSVRepository):
+    fieldnames = ['id', 'name', 'description']
+    
     def __init__(self):
         super().__init__("categories.csv")
     
+    def _to_model(self, row: Dict[str, str]) -> Category:
+        return Category(
+            id=int(row['id']),
+            name=row['name'],
+            description=row['description']
+        )
+    
     def get_all(self) -> List[Category]:
         # Get all categories
-        data = self._read_csv()
-        categories = []
-        for row in data:
-            categories.append(Category(
-                id=int(row['id']),
-                name=row['name'],
-                description=row['description']
-            ))
-        return categories
+        return list(self.iter_all())
     
     def get_by_id(self, category_id: int) -> Optional[Category]:
         # Get category by ID
-        data = self._read_csv()
-        for row in data:
-            if int(row['id']) == category_id:
-                return Category(
-                    id=int(row['id']),
-                    name=row['name'],
-                    description=row['description']
-                )
-        return None
+        row = self._find_by_key(category_id)
+        return self._to_model(row) if row else None
+    
+    def get_name_map(self) -> Dict[int, str]:
+        # Map every category ID to its name, for joining into list rows
+        return {int(row['id']): row['name'] for row in self._iter_rows()}
 
 class ProjectRepository(CSVRepository):
-    def __init__(self):
+    fieldnames = ['id', 'name', 'description', 'target_amount', 'current_amount', 'deadline', 'category_id', 'created_at']
+    
+    def __init__(self, identity_map: Optional[IdentityMap] = None):
         super().__init__("projects.csv")
+        # With an identity map, a project ID always resolves to the same Project
+        self.identity_map = identity_map
+    
+    def _primary_key(self, row: Dict[str, str]) -> str:
+        # Project IDs are compared as strings
+        return str(row['id'])
+    
+    def _to_model(self, row: Dict[str, str]) -> Project:
+        if self.identity_map is not None:
+            return self.identity_map.resolve(str(row['id']), row, self._build_model)
+        return self._build_model(row)
+    
+    def _build_model(self, row: Dict[str, str]) -> Project:
+        return Project(
+            id=row['id'],
+            name=row['name'],
+            description=row['description'],
+            target_amount=float(row['target_amount']),
+            current_amount=float(row['current_amount']),
+            deadline=row['deadline'],
+            category_id=int(row['category_id']),
+            created_at=row['created_at']
+        )
     
     def get_all(self) -> List[Project]:
         # Get all projects
-        data = self._read_csv()
-        projects = []
-        for row in data:
-            projects.append(Project(
-                id=row['id'],
-                name=row['name'],
-                description=row['description'],
-                target_amount=float(row['target_amount']),
-                current_amount=float(row['current_amount']),
-                deadline=row['deadline'],
-                category_id=int(row['category_id']),
-                created_at=row['created_at']
-            ))
-        return projects
+        return list(self.iter_all())
     
     def get_by_id(self, project_id: str) -> Optional[Project]:
         # Get project by ID
-        data = self._read_csv()
-        for row in data:
-            # Ensure both IDs are strings for comparison
-            if str(row['id']) == str(project_id):
-                return Project(
-                    id=row['id'],
-                    name=row['name'],
-                    description=row['description'],
-                    target_amount=float(row['target_amount']),
-                    current_amount=float(row['current_amount']),
-                    deadline=row['deadline'],
-                    category_id=int(row['category_id']),
-                    created_at=row['created_at']
-                )
-        return None
+        row = self._find_by_key(str(project_id))
+        return self._to_model(row) if row else None
+    
+    def iter_by_category(self, category_id: int) -> Iterator[Project]:
+        # Yield projects of one category; other rows are skipped before a model is built
+        for row in self._iter_rows():
+            if int(row['category_id']) == category_id:
+                yield self._to_model(row)
     
     def get_by_category(self, category_id: int) -> List[Project]:
         # Get projects by category
-        all_projects = self.get_all()
-        return [p for p in all_projects if p.category_id == category_id]
+        return list(self.iter_by_category(category_id))
+    
+    def get_search_index(self) -> ProjectSearchIndex:
+        # Get the text search index, kept current as projects are written
+        table = self._load_table()
+        if table is None:
+            return ProjectSearchIndex()
+        return table.get_index('search', ProjectSearchIndex)
+    
+    def search_matches(self, query: str, fuzzy: bool = False) -> Set[str]:
+        # IDs of matching projects, unranked, for filtering a list kept in another order
+        return self.get_search_index().matches(query, fuzzy=fuzzy)
     
     def search_by_name(self, search_term: str) -> List[Project]:
-        # Search projects by name
-        all_projects = self.get_all()
-        return [p for p in all_projects if search_term.lower() in p.name.lower()]
+        # Search projects by name, best matches first
+        ids = self.get_search_index().search(search_term, fields=('name',))
+        return [project for project in map(self.get_by_id, ids) if project]
+    
+    @staticmethod
+    def _newest_first(row: Dict[str, str]) -> int:
+        # Negated microseconds since the epoch, so ascending order is newest first
+        return -((decode_datetime(row['created_at']) - datetime(1970, 1, 1)) // timedelta(microseconds=1))
+    
+    @staticmethod
+    def _closest_deadline_first(row: Dict[str, str]) -> date:
+        return decode_date(row['deadline'])
+    
+    @staticmethod
+    def _highest_funding_first(row: Dict[str, str]) -> float:
+        return -float(row['current_amount'])
+    
+    def _sorted_rows(self, order: str, key_func: Callable[[Dict[str, str]], Any]) -> List[Dict[str, str]]:
+        # Rows in a persistent sort order. The order is built once per table load and
+        # kept current by every insert and update (a changed key repositions the row
+        # with bisect), so reading it is a slice rather than a sort.
+        table = self._load_table()
+        if table is None:
+            return []
+        return table.get_index(f"sorted_{order}", lambda: SortedIndex(key_func)).first()
     
     def get_sorted_by_newest(self) -> List[Project]:
         # Get projects sorted by newest first
-        projects = self.get_all()
-        return sorted(projects, key=lambda p: p.created_at, reverse=True)
+        return [self._to_model(row) for row in self._sorted_rows('newest', self._newest_first)]
     
     def get_sorted_by_deadline(self) -> List[Project]:
         # Get projects sorted by deadline (closest first)
-        projects = self.get_all()
-        return sorted(projects, key=lambda p: p.deadline)
+        return [self._to_model(row) for row in self._sorted_rows('deadline', self._closest_deadline_first)]
     
     def get_sorted_by_funding(self) -> List[Project]:
         # Get projects sorted by funding amount (highest first)
-        projects = self.get_all()
-        return sorted(projects, key=lambda p: p.current_amount, reverse=True)
+        return [self._to_model(row) for row in self._sorted_rows('funding', self._highest_funding_first)]
+    
+    def iter_active(self) -> Iterator[Project]:
+        # Yield active projects (not past deadline)
+        return self.iter_where(lambda p: p.is_active)
     
     def get_active_projects(self) -> List[Project]:
         # Get active projects (not past deadline)
-        all_projects = self.get_all()
-        return [p for p in all_projects if p.is_active]
+        return list(self.iter_active())
+    
+    def get_leaderboard(self) -> FundingLeaderboard:
+        # Get the funding leaderboard, kept in order as project amounts are updated
+        table = self._load_table()
+        if table is None:
+            return FundingLeaderboard()
+        return table.get_index('funding_leaderboard', FundingLeaderboard)
+    
+    def get_top_funded(self, limit: int, category_id: Optional[int] = None) -> List[Project]:
+        # Get the best funded projects, overall or within one category, without sorting
+        return [self._to_model(row) for row in self.get_leaderboard().top(limit, category_id)]
     
     def update(self, project: Project) -> Project:
         # Update project
-        data = self._read_csv()
-        for i, row in enumerate(data):
-            if row['id'] == str(project.id):
-                data[i] = {
-                    'id': project.id,
-                    'name': project.name,
-                    'description': project.description,
-                    'target_amount': project.target_amount,
-                    'current_amount': project.current_amount,
-                    'deadline': project.deadline.isoformat(),
-                    'category_id': project.category_id,
-                    'created_at': project.created_at.isoformat()
-                }
-                break
-        
-        self._write_csv(data, ['id', 'name', 'description', 'target_amount', 'current_amount', 'deadline', 'category_id', 'created_at'])
+        self._update_row(str(project.id), {
+            'id': project.id,
+            'name': project.name,
+            'description': project.description,
+            'target_amount': project.target_amount,
+            'current_amount': project.current_amount,
+            'deadline': project.deadline.isoformat(),
+            'category_id': project.category_id,
+            'created_at': project.created_at.isoformat()
+        })
+        if self.identity_map is not None:
+            # Also covers a rollback: the shared instance is re-read from its row
+            self.identity_map.invalidate(str(project.id))
         return project
 
 class RewardRepository(CSVRepository):
+    fieldnames = ['id', 'project_id', 'name', 'description', 'min_amount', 'quota', 'remaining_quota']
+    
     def __init__(self):
         super().__init__("reward_tiers.csv")
     
+    def _to_model(self, row: Dict[str, str]) -> RewardTier:
+        return RewardTier(
+            id=int(row['id']),
+            project_id=row['project_id'],
+            name=row['name'],
+            description=row['description'],
+            min_amount=float(row['min_amount']),
+            quota=int(row['quota']),
+            remaining_quota=int(row['remaining_quota'])
+        )
+    
     def get_by_project(self, project_id: str) -> List[RewardTier]:
         # Get reward tiers by project ID
-        data = self._read_csv()
-        tiers = []
-        for row in data:
-            if row['project_id'] == str(project_id):
-                tiers.append(RewardTier(
-                    id=int(row['id']),
-                    project_id=row['project_id'],
-                    name=row['name'],
-                    description=row['description'],
-                    min_amount=float(row['min_amount']),
-                    quota=int(row['quota']),
-                    remaining_quota=int(row['remaining_quota'])
-                ))
-        return tiers
+        rows = self._find_all_by('project_id', lambda row: row['project_id'], str(project_id))
+        return [self._to_model(row) for row in rows]
     
     def get_by_id(self, reward_id: int) -> Optional[RewardTier]:
         # Get reward tier by ID
-        data = self._read_csv()
-        for row in data:
-            if int(row['id']) == reward_id:
-                return RewardTier(
-                    id=int(row['id']),
-                    project_id=row['project_id'],
-                    name=row['name'],
-                    description=row['description'],
-                    min_amount=float(row['min_amount']),
-                    quota=int(row['quota']),
-                    remaining_quota=int(row['remaining_quota'])
-                )
-        return None
+        row = self._find_by_key(reward_id)
+        return self._to_model(row) if row else None
     
     def get_available_by_project(self, project_id: str) -> List[RewardTier]:
         # Get available reward tiers by project ID
@@ -299,43 +487,102 @@ class RewardRepository(CSVRepository):
     
     def update(self, reward_tier: RewardTier) -> RewardTier:
         # Update reward tier
-        data = self._read_csv()
-        for i, row in enumerate(data):
-            if int(row['id']) == reward_tier.id:
-                data[i] = {
-                    'id': reward_tier.id,
-                    'project_id': reward_tier.project_id,
-                    'name': reward_tier.name,
-                    'description': reward_tier.description,
-                    'min_amount': reward_tier.min_amount,
-                    'quota': reward_tier.quota,
-                    'remaining_quota': reward_tier.remaining_quota
-                }
-                break
-        
-        self._write_csv(data, ['id', 'project_id', 'name', 'description', 'min_amount', 'quota', 'remaining_quota'])
+        self._update_row(reward_tier.id, {
+            'id': reward_tier.id,
+            'project_id': reward_tier.project_id,
+            'name': reward_tier.name,
+            'description': reward_tier.description,
+            'min_amount': reward_tier.min_amount,
+            'quota': reward_tier.quota,
+            'remaining_quota': reward_tier.remaining_quota
+        })
         return reward_tier
     
     def decrease_quota(self, reward_id: int) -> bool:
         # Decrease remaining quota by 1
-        data = self._read_csv()
-        for i, row in enumerate(data):
-            if int(row['id']) == reward_id:
-                current_quota = int(row['remaining_quota'])
-                if current_quota > 0:
-                    data[i]['remaining_quota'] = str(current_quota - 1)
-                    self._write_csv(data, ['id', 'project_id', 'name', 'description', 'min_amount', 'quota', 'remaining_quota'])
-                    return True
-        return False
+        def decreased(row: Dict[str, str]) -> Optional[Dict[str, Any]]:
+            current_quota = int(row['remaining_quota'])
+            if current_quota <= 0:
+                return None
+            return {'remaining_quota': current_quota - 1}
+        
+        return self._update_row(reward_id, decreased)
 
 class PledgeRepository(CSVRepository):
-    def __init__(self):
+    fieldnames = ['id', 'user_id', 'project_id', 'reward_tier_id', 'amount', 'status', 'created_at']
+    
+    def __init__(self, mapped: bool = False):
         super().__init__("pledges.csv")
+        # Mapped mode reads pledges.csv through mmap and a row-offset index instead of
+        # the table cache, parsing a row only when it is requested. It is opt-in, for
+        # read-only tools over large ledgers: it sees pledges once the journal has
+        # checkpointed them to the file, so the app's own screens use the cache.
+        self.mapped = mapped
+    
+    def _mapped_file(self) -> MappedCSV:
+        return get_mapped(self.file_path)
+    
+    def _rows_where(self, column: str, key_func: Callable[[Dict[str, str]], Any],
+                    key: Any) -> List[Dict[str, str]]:
+        # Get the rows whose column matches key, from the cache index or the mapped file
+        if self.mapped:
+            mapped = self._mapped_file()
+            return list(mapped.rows(mapped.positions(column, str(key))))
+        return self._find_all_by(column, key_func, key)
+    
+    def count(self) -> int:
+        # Number of pledges, without materializing any of them in mapped mode
+        if self.mapped:
+            return len(self._mapped_file())
+        table = self._load_table()
+        return len(table.rows) if table else 0
+    
+    def _iter_rows(self) -> Iterator[Dict[str, str]]:
+        # In mapped mode rows are parsed straight from the mapping as they are consumed
+        if self.mapped:
+            mapped = self._mapped_file()
+            return mapped.rows(range(len(mapped)))
+        return super()._iter_rows()
+    
+    def get_at(self, position: int) -> Pledge:
+        # Get the pledge at a row position (file order)
+        if self.mapped:
+            return self._to_model(self._mapped_file().row(position))
+        table = self._load_table()
+        if table is None:
+            raise IndexError("row position out of range")
+        with table.lock:
+            row = table.rows[position]
+        return self._to_model(row)
+    
+    def get_range(self, start: int, stop: int) -> List[Pledge]:
+        # Get the pledges in row positions [start, stop), e.g. one page of a list
+        if self.mapped:
+            stop = min(stop, len(self._mapped_file()))
+            return [self._to_model(row) for row in self._mapped_file().rows(range(start, stop))]
+        table = self._load_table()
+        if table is None:
+            return []
+        # Slice the cached rows directly rather than copying the whole table first
+        with table.lock:
+            rows = table.rows[start:stop]
+        return [self._to_model(row) for row in rows]
+    
+    def _to_model(self, row: Dict[str, str]) -> Pledge:
+        return Pledge(
+            id=int(row['id']),
+            user_id=int(row['user_id']),
+            project_id=row['project_id'],
+            reward_tier_id=int(row['reward_tier_id']) if row['reward_tier_id'] else None,
+            amount=float(row['amount']),
+            status=row['status'],
+            created_at=row['created_at']
+        )
     
     def create(self, pledge: Pledge) -> Pledge:
-        # Create a new pledge
-        data = self._read_csv()
-        pledge.id = self._get_next_id(data)
+        # Create a new pledge (IDs reserved up front, e.g. by bulk imports, are kept)
+        if not pledge.id:
+            pledge.id = self._next_id()
         
         pledge_data = {
             'id': pledge.id,
@@ -346,94 +593,109 @@ class PledgeRepository(CSVRepository):
             'status': pledge.status.value,
             'created_at': pledge.created_at.isoformat()
         }
-        data.append(pledge_data)
         
-        self._write_csv(data, ['id', 'user_id', 'project_id', 'reward_tier_id', 'amount', 'status', 'created_at'])
+        self._append_csv(pledge_data, self.fieldnames)
         return pledge
     
+    def _project_rows(self, project_id: str) -> List[Dict[str, str]]:
+        # Get the raw rows of one project's pledges through the project index
+        return self._rows_where('project_id', lambda row: row['project_id'], str(project_id))
+    
+    def get_all(self) -> List[Pledge]:
+        # Get all pledges
+        return list(self.iter_all())
+    
+    def iter_by_user(self, user_id: int) -> Iterator[Pledge]:
+        # Yield pledges by user ID
+        rows = self._rows_where('user_id', lambda row: int(row['user_id']), user_id)
+        return map(self._to_model, rows)
+    
     def get_by_user(self, user_id: int) -> List[Pledge]:
         # Get pledges by user ID
-        data = self._read_csv()
-        pledges = []
-        for row in data:
-            if int(row['user_id']) == user_id:
-                pledges.append(Pledge(
-                    id=int(row['id']),
-                    user_id=int(row['user_id']),
-                    project_id=row['project_id'],
-                    reward_tier_id=int(row['reward_tier_id']) if row['reward_tier_id'] else None,
-                    amount=float(row['amount']),
-                    status=row['status'],
-                    created_at=row['created_at']
-                ))
-        return pledges
+        return list(self.iter_by_user(user_id))
+    
+    def count_by_user(self, user_id: int) -> int:
+        # Number of pledges by a user, without building any of them
+        if self.mapped:
+            return len(self._mapped_file().positions('user_id', str(user_id)))
+        table = self._load_table()
+        return self._user_index(table).count(user_id) if table else 0
+    
+    def get_by_user_range(self, user_id: int, start: int, stop: int) -> List[Pledge]:
+        # Get a user's pledges [start, stop) in file order; only that page is built
+        if self.mapped:
+            mapped = self._mapped_file()
+            positions = mapped.positions('user_id', str(user_id))[start:stop]
+            return [self._to_model(row) for row in mapped.rows(positions)]
+        table = self._load_table()
+        if table is None:
+            return []
+        return [self._to_model(row) for row in self._user_index(table).get(user_id)[start:stop]]
+    
+    @staticmethod
+    def _user_index(table) -> MultiIndex:
+        # The same index _rows_where('user_id', ...) builds
+        return table.get_index('user_id', lambda: MultiIndex(lambda row: int(row['user_id'])))
     
     def get_by_project(self, project_id: str) -> List[Pledge]:
         # Get pledges by project ID
-        data = self._read_csv()
-        pledges = []
-        for row in data:
-            if row['project_id'] == str(project_id):
-                pledges.append(Pledge(
-                    id=int(row['id']),
-                    user_id=int(row['user_id']),
-                    project_id=row['project_id'],
-                    reward_tier_id=int(row['reward_tier_id']) if row['reward_tier_id'] else None,
-                    amount=float(row['amount']),
-                    status=row['status'],
-                    created_at=row['created_at']
-                ))
-        return pledges
+        return [self._to_model(row) for row in self._project_rows(project_id)]
+    
+    def iter_by_status(self, status: PledgeStatus) -> Iterator[Pledge]:
+        # Yield pledges by status
+        rows = self._rows_where('status', lambda row: row['status'], status.value)
+        return map(self._to_model, rows)
     
     def get_by_status(self, status: PledgeStatus) -> List[Pledge]:
         # Get pledges by status
-        data = self._read_csv()
-        pledges = []
-        for row in data:
-            if row['status'] == status.value:
-                pledges.append(Pledge(
-                    id=int(row['id']),
-                    user_id=int(row['user_id']),
-                    project_id=row['project_id'],
-                    reward_tier_id=int(row['reward_tier_id']) if row['reward_tier_id'] else None,
-                    amount=float(row['amount']),
-                    status=row['status'],
-                    created_at=row['created_at']
-                ))
-        return pledges
+        return list(self.iter_by_status(status))
     
     def get_successful_by_project(self, project_id: str) -> List[Pledge]:
         # Get successful pledges by project ID
-        all_pledges = self.get_by_project(project_id)
-        return [p for p in all_pledges if p.status == PledgeStatus.SUCCESS]
+        rows = self._project_rows(project_id)
+        return [self._to_model(row) for row in rows if row['status'] == PledgeStatus.SUCCESS.value]
     
     def get_rejected_by_project(self, project_id: str) -> List[Pledge]:
         # Get rejected pledges by project ID
-        all_pledges = self.get_by_project(project_id)
-        return [p for p in all_pledges if p.status == PledgeStatus.REJECTED]
+        rows = self._project_rows(project_id)
+        return [self._to_model(row) for row in rows if row['status'] == PledgeStatus.REJECTED.value]
     
     def get_statistics(self) -> Dict[str, int]:
         # Get pledge statistics
-        data = self._read_csv()
-        total = len(data)
-        successful = len([row for row in data if row['status'] == 'SUCCESS'])
-        rejected = len([row for row in data if row['status'] == 'REJECTED'])
+        if self.mapped:
+            mapped = self._mapped_file()
+            return {
+                'total': len(mapped),
+                'successful': len(mapped.positions('status', 'SUCCESS')),
+                'rejected': len(mapped.positions('status', 'REJECTED'))
+            }
         
-        return {
-            'total': total,
-            'successful': successful,
-            'rejected': rejected
-        }
-    
-    def get_project_statistics(self, project_id: str) -> Dict[str, int]:
-        # Get pledge statistics for a specific project
-        project_pledges = self.get_by_project(project_id)
-        total = len(project_pledges)
-        successful = len([p for p in project_pledges if p.status == PledgeStatus.SUCCESS])
-        rejected = len([p for p in project_pledges if p.status == PledgeStatus.REJECTED])
+        table = self._load_table()
+        if table is None:
+            return {'total': 0, 'successful': 0, 'rejected': 0}
+        
+        # Counters seeded by one scan when the table is loaded, then kept current
+        # in O(1) by every insert (including journaled and rolled-back ones)
+        counters = table.get_index('status_counts', lambda: CountIndex(lambda row: row['status']))
         
         return {
-            'total': total,
-            'successful': successful,
-            'rejected': rejected
+            'total': counters.total,
+            'successful': counters.count(PledgeStatus.SUCCESS.value),
+            'rejected': counters.count(PledgeStatus.REJECTED.value)
         }
+    
+    def get_project_aggregates(self) -> ProjectPledgeStats:
+        # Get the per-project pledge aggregates, maintained as pledges are written
+        table = self._load_table()
+        if table is None:
+            return ProjectPledgeStats()
+        return table.get_index('project_stats', ProjectPledgeStats)
+    
+    def get_project_statistics(self, project_id: str) -> Dict[str, Any]:
+        # Get pledge statistics for a specific project: total/successful/rejected
+        # counts, successful_amount, distinct backers and last_pledge_at
+        if self.mapped:
+            stats = ProjectPledgeStats()
+            stats.build(self._project_rows(project_id))
+            return stats.get(project_id)
+        return self.get_project_aggregates().get(project_id)
@@ -0,0 +1,163 @@
+"""
+In-memory text search index over project names and descriptions
+"""
+
+import heapq
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Fields that are searched, in ranking order: a name match beats a description match
+SEARCH_FIELDS = ('name', 'description')
+
+# Queries shorter than a trigram are answered by scanning the indexed texts
+MIN_TRIGRAM_QUERY = 3
+
+# Share of a query's trigrams a field must contain to count as a typo-tolerant match
+FUZZY_THRESHOLD = 0.4
+
+def normalize_text(text: str) -> str:
+    # Lower-case and collapse runs of whitespace, the form both texts and queries are matched in
+    return ' '.join((text or '').lower().split())
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def padded_trigrams(text: str) -> Set[str]:
+    # Trigrams of the text with word boundaries marked, so word starts and ends count too
+    return trigrams(f" {text} ")
+
+class ProjectSearchIndex:
+    """Trigram index for as-you-type project search"""
+
+    # Registered as an index of the cached projects table, so it is built once per
+    # load and kept current by project inserts and updates. A query of three or more
+    # characters intersects the posting sets of its trigrams and then confirms the
+    # substring on those few candidates. Shorter queries have too few trigrams to
+    # narrow anything down, so they are checked against the normalized texts directly.
+    # Results are ranked project IDs: name matches before description matches, then
+    # earlier and word-start matches first, then by name.
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # project id -> normalized text per field
+        self.texts: Dict[str, Tuple[str, ...]] = {}
+        # field -> trigram -> project ids whose (padded) field text contains it
+        self.grams: Dict[str, Dict[str, Set[str]]] = {field: {} for field in SEARCH_FIELDS}
+
+    # Only a change of the searched columns needs reindexing
+    @staticmethod
+    def key_func(row: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(row.get(field, '') for field in SEARCH_FIELDS)
+
+    # Index protocol used by CachedTable
+
+    def build(self, rows: Iterable[Dict[str, str]]):
+        with self._lock:
+            self.texts = {}
+            self.grams = {field: {} for field in SEARCH_FIELDS}
+            for row in rows:
+                self.add(row)
+
+    def add(self, row: Dict[str, str]):
+        project_id = str(row['id'])
+        texts = tuple(normalize_text(row.get(field, '')) for field in SEARCH_FIELDS)
+        with self._lock:
+            self.texts[project_id] = texts
+            for field, text in zip(SEARCH_FIELDS, texts):
+                postings = self.grams[field]
+                for gram in padded_trigrams(text):
+                    postings.setdefault(gram, set()).add(project_id)
+
+    def remove(self, row: Dict[str, str]):
+        project_id = str(row['id'])
+        with self._lock:
+            texts = self.texts.pop(project_id, None)
+            if texts is None:
+                return
+            for field, text in zip(SEARCH_FIELDS, texts):
+                postings = self.grams[field]
+                for gram in padded_trigrams(text):
+                    ids = postings.get(gram)
+                    if ids is not None:
+                        ids.discard(project_id)
+                        if not ids:
+                            del postings[gram]
+
+    # Queries
+
+    def search(self, query: str, fields: Tuple[str, ...] = SEARCH_FIELDS,
+               fuzzy: bool = False, limit: Optional[int] = None) -> List[str]:
+        # Ranked IDs of projects whose fields contain the query. With fuzzy=True a
+        # query that matches nothing falls back to trigram similarity (typos).
+        query = normalize_text(query)
+        if not query:
+            return []
+        with self._lock:
+            ranked = self._rank(self._substring_matches(query, fields), query, fields, limit)
+            if not ranked and fuzzy and len(query) >= MIN_TRIGRAM_QUERY:
+                ranked = self._fuzzy_matches(query, fields)
+        return ranked[:limit]
+
+    def matches(self, query: str, fields: Tuple[str, ...] = SEARCH_FIELDS, fuzzy: bool = False) -> Set[str]:
+        # IDs matching the query, unranked; for callers that keep their own order
+        query = normalize_text(query)
+        if not query:
+            return set()
+        with self._lock:
+            found = self._substring_matches(query, fields)
+            if not found and fuzzy and len(query) >= MIN_TRIGRAM_QUERY:
+                found = set(self._fuzzy_matches(query, fields))
+            return found
+
+    def _substring_matches(self, query: str, fields: Tuple[str, ...]) -> Set[str]:
+        # Candidates share every trigram of the query; the substring check weeds out the rest
+        if len(query) < MIN_TRIGRAM_QUERY:
+            matches = set()
+            for field in fields:
+                slot = SEARCH_FIELDS.index(field)
+                matches.update([pid for pid, texts in self.texts.items() if query in texts[slot]])
+            return matches
+        query_grams = trigrams(query)
+        matches: Set[str] = set()
+        for field in fields:
+            postings = self.grams[field]
+            sets = [postings.get(gram) for gram in query_grams]
+            if not all(sets):
+                continue
+            sets.sort(key=len)
+            candidates = set(sets[0]).intersection(*sets[1:])
+            slot = SEARCH_FIELDS.index(field)
+            matches.update(pid for pid in candidates if query in self.texts[pid][slot])
+        return matches
+
+    def _rank(self, ids: Set[str], query: str, fields: Tuple[str, ...],
+              limit: Optional[int] = None) -> List[str]:
+        def score(project_id: str):
+            texts = self.texts[project_id]
+            for rank, field in enumerate(fields):
+                text = texts[SEARCH_FIELDS.index(field)]
+                position = text.find(query)
+                if position >= 0:
+                    word_start = position == 0 or not text[position - 1].isalnum()
+                    return (rank, not word_start, position, texts[0], project_id)
+            return (len(fields), True, 0, texts[0], project_id)
+
+        if limit is not None and limit < len(ids):
+            return heapq.nsmallest(limit, ids, key=score)
+        return sorted(ids, key=score)
+
+    def _fuzzy_matches(self, query: str, fields: Tuple[str, ...]) -> List[str]:
+        # Rank projects by the share of the query's padded trigrams their fields contain
+        query_grams = padded_trigrams(query)
+        best: Dict[str, float] = {}
+        for field in fields:
+            postings = self.grams[field]
+            shared: Dict[str, int] = {}
+            for gram in query_grams:
+                for project_id in postings.get(gram, ()):
+                    shared[project_id] = shared.get(project_id, 0) + 1
+            for project_id, count in shared.items():
+                similarity = count / len(query_grams)
+                if similarity >= FUZZY_THRESHOLD and similarity > best.get(project_id, 0.0):
+                    best[project_id] = similarity
+        return sorted(best, key=lambda pid: (-best[pid], self.texts[pid][0], pid))
@@ -0,0 +1,57 @@
+"""
+Binary snapshots of parsed CSV tables for fast cold starts
+"""
+
+import marshal
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Bump when the snapshot layout changes; older snapshots are then ignored
+SNAPSHOT_VERSION = 1
+
+# Each column is stored as one string joined on this separator: marshal loads a
+# handful of large strings far faster than millions of small ones
+SEPARATOR = '\x1f'
+
+def snapshot_path(file_path: str) -> str:
+    # Snapshot of data/pledges.csv lives at data/.pledges.csv.snap
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, f".{name}.snap")
+
+def load_snapshot(file_path: str, source: Tuple[int, int]) -> Optional[Tuple[List[str], List[Dict[str, str]]]]:
+    # Load the rows of a CSV from its snapshot, if the snapshot was taken of exactly
+    # this version of the file (same mtime and size); otherwise return None
+    try:
+        with open(snapshot_path(file_path), 'rb') as file:
+            version, snapshot_source, fieldnames, count, columns = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if version != SNAPSHOT_VERSION or tuple(snapshot_source) != tuple(source):
+        return None
+    if count == 0:
+        return list(fieldnames), []
+    values = [column.split(SEPARATOR) for column in columns]
+    return list(fieldnames), [dict(zip(fieldnames, row)) for row in zip(*values)]
+
+def save_snapshot(file_path: str, source: Tuple[int, int], fieldnames: List[str],
+                  rows: List[Dict[str, str]]) -> bool:
+    # Write a snapshot of rows parsed from the CSV version identified by source
+    columns = []
+    for name in fieldnames:
+        values = ['' if row.get(name) is None else row[name] for row in rows]
+        column = SEPARATOR.join(values)
+        if column.count(SEPARATOR) != max(len(values) - 1, 0):
+            # A value contains the separator itself; keep parsing the CSV instead
+            return False
+        columns.append(column)
+
+    path = snapshot_path(file_path)
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as file:
+            marshal.dump((SNAPSHOT_VERSION, tuple(source), list(fieldnames), len(rows), columns), file)
+        os.replace(tmp_path, path)
+    except OSError:
+        return False
+    return True
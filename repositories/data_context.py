@@ -0,0 +1,24 @@
+"""
+Shared repositories for one running application
+"""
+
+from repositories.csv_identity import IdentityMap
+from repositories.csv_repositories import (
+    UserRepository, CategoryRepository, ProjectRepository,
+    RewardRepository, PledgeRepository
+)
+
+class DataContext:
+    """One instance of each repository, shared by every controller"""
+
+    # Built once by the application and handed to each controller, so all of
+    # them read through the same repositories and see the same Project objects:
+    # the projects identity map resolves a project ID to a single instance.
+
+    def __init__(self):
+        self.projects = IdentityMap()
+        self.user_repo = UserRepository()
+        self.category_repo = CategoryRepository()
+        self.project_repo = ProjectRepository(identity_map=self.projects)
+        self.reward_tier_repo = RewardRepository()
+        self.pledge_repo = PledgeRepository()
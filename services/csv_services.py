@@ -2,14 +2,16 @@
 CSV-based services for business logic
 """
 
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 from datetime import date, datetime
 import hashlib
+import math
 
 from repositories.csv_repositories import (
     UserRepository, CategoryRepository, ProjectRepository, 
     RewardRepository, PledgeRepository
 )
+from models.csv_decoding import decode_datetime
 from models.csv_models import User, Project, RewardTier, Pledge, PledgeStatus
 
 class AuthService:
@@ -24,10 +26,10 @@ class AuthService:
         return self.hash_password(password) == hashed
     
     def register(self, username: str, email: str, password: str) -> Optional[User]:
-        if self.user_repo.get_by_username(username):
+        if self.user_repo.username_exists(username):
             raise ValueError("Username already exists")
         
-        if self.user_repo.get_by_email(email):
+        if self.user_repo.email_exists(email):
             raise ValueError("Email already exists")
         
         # Create new user
@@ -70,14 +72,19 @@ class AuthService:
         return None
 
 class ProjectService:
-    def __init__(self, project_repo, category_repo, reward_repo):
+    def __init__(self, project_repo, category_repo, reward_repo, pledge_repo):
         self.project_repo = project_repo
         self.reward_repo = reward_repo
         self.category_repo = category_repo
+        self.pledge_repo = pledge_repo
     
     def get_all_projects(self) -> List[Project]:
         return self.project_repo.get_all()
     
+    def iter_projects(self) -> Iterator[Project]:
+        # Stream projects one at a time, for callers that only count, sum or filter
+        return self.project_repo.iter_all()
+    
     def get_project_by_id(self, project_id: str) -> Optional[Project]:
         return self.project_repo.get_by_id(project_id)
     
@@ -100,6 +107,40 @@ class ProjectService:
     def get_active_projects(self) -> List[Project]:
         return self.project_repo.get_active_projects()
     
+    def get_top_funded_projects(self, limit: int, category_id: Optional[int] = None) -> List[Project]:
+        # Highest current_amount first, read off the maintained funding leaderboard
+        return self.project_repo.get_top_funded(limit, category_id)
+    
+    def get_top_projects(self, limit: int, category_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Leaderboard rows with their category names joined in
+        category_names = self.category_repo.get_name_map()
+        return [self._project_row(project, category_names)
+                for project in self.get_top_funded_projects(limit, category_id)]
+    
+    def get_project_rows(self, sort_by: str, search_term: str = "") -> List[Dict[str, Any]]:
+        # Rows for the projects list in the chosen order, filtered through the search
+        # index and joined with category names in one pass over the projects
+        category_names = self.category_repo.get_name_map()
+        projects = self.get_projects_sorted(sort_by)
+        if search_term.strip():
+            matches = self.project_repo.search_matches(search_term, fuzzy=True)
+            projects = [project for project in projects if project.id in matches]
+        return [self._project_row(project, category_names) for project in projects]
+    
+    def _project_row(self, project: Project, category_names: Dict[int, str]) -> Dict[str, Any]:
+        # Flatten a project into a list row with its category name
+        return {
+            'id': project.id,
+            'name': project.name,
+            'category_id': project.category_id,
+            'category': category_names.get(project.category_id, "Unknown"),
+            'target_amount': project.target_amount,
+            'current_amount': project.current_amount,
+            'progress_percentage': project.progress_percentage,
+            'deadline': project.deadline,
+            'is_active': project.is_active
+        }
+    
     def get_project_details(self, project_id: str) -> Optional[Dict[str, Any]]:
         project = self.project_repo.get_by_id(project_id)
         if not project:
@@ -126,8 +167,7 @@ class ProjectService:
             })
         
         # Get pledge statistics
-        pledge_repo = PledgeRepository()
-        stats = pledge_repo.get_project_statistics(project_id)
+        stats = self.pledge_repo.get_project_statistics(project_id)
         
         return {
             'project': project,
@@ -153,10 +193,18 @@ class PledgeService:
         self.project_repo = project_repo
         self.reward_repo = reward_repo
         # Create a ProjectService instance with the same repositories
-        self.project_service = ProjectService(project_repo, None, reward_repo)
+        self.project_service = ProjectService(project_repo, None, reward_repo, pledge_repo)
+        # Opening the journal replays any pledge transactions left over from a crash
+        self.journal = pledge_repo.journal()
     
     def create_pledge(self, user_id: int, project_id: str, amount: float, 
                      reward_tier_id: Optional[int] = None) -> Pledge:
+        # The checks and the three file changes commit as one journal record
+        with self.journal.transaction():
+            return self._create_pledge(user_id, project_id, amount, reward_tier_id)
+    
+    def _create_pledge(self, user_id: int, project_id: str, amount: float, 
+                       reward_tier_id: Optional[int] = None) -> Pledge:
         project = self.project_repo.get_by_id(project_id)
         if not project:
             raise ValueError("Project not found c")
@@ -164,6 +212,9 @@ class PledgeService:
         if not project.is_active:
             raise ValueError("Project deadline has passed")
         
+        if not math.isfinite(amount):
+            raise ValueError("Amount must be a finite number")
+        
         if amount <= 0:
             raise ValueError("Amount must be greater than 0")
         
@@ -192,18 +243,77 @@ class PledgeService:
             created_at=datetime.now()
         )
         
-        # Save pledge
+        return self._apply_pledge(pledge)
+    
+    def _apply_pledge(self, pledge: Pledge) -> Pledge:
+        # Save an already validated pledge and apply its effects
         created_pledge = self.pledge_repo.create(pledge)
         
         # Update project amount
-        self.project_service.update_project_amount(project_id, amount)
+        self.project_service.update_project_amount(pledge.project_id, pledge.amount)
         
         # Decrease reward tier quota if applicable
-        if reward_tier_id:
-            self.reward_repo.decrease_quota(reward_tier_id)
+        if pledge.reward_tier_id:
+            self.reward_repo.decrease_quota(pledge.reward_tier_id)
         
         return created_pledge
     
+    def create_pledges_bulk(self, pledges: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Import a batch of pledges (e.g. collected offline at camp booths).
+        # Each item is a dict with user_id, project_id, amount and optional
+        # reward_tier_id (and created_at). Rows are validated one after another
+        # against the in-memory project/tier state, so earlier rows in the batch
+        # use up quota for later ones; rejected rows are recorded as REJECTED
+        # pledges. The whole batch is one journal transaction and every affected
+        # CSV is written once at the end. Returns one result dict per input row.
+        items = list(pledges)
+        if not items:
+            return []
+        
+        pledge_ids = iter(self.pledge_repo.reserve_ids(len(items)))
+        results = []
+        with self.journal.transaction():
+            for index, item in enumerate(items):
+                pledge_id = next(pledge_ids)
+                try:
+                    user_id = int(item['user_id'])
+                    project_id = str(item['project_id'])
+                    amount = float(item['amount'])
+                    reward_tier_id = int(item['reward_tier_id']) if item.get('reward_tier_id') else None
+                    if not math.isfinite(amount):
+                        raise ValueError(f"amount must be a finite number, got {amount}")
+                    # Parsed here so one bad timestamp rejects its row, not the batch
+                    created_at = item.get('created_at') or datetime.now()
+                    if isinstance(created_at, str):
+                        created_at = decode_datetime(created_at)
+                    elif not isinstance(created_at, datetime):
+                        raise TypeError(f"created_at must be a datetime or ISO string, got {created_at!r}")
+                except (KeyError, TypeError, ValueError) as e:
+                    # Not enough information to record even a rejected pledge
+                    results.append({'index': index, 'success': False,
+                                    'message': f"Invalid row: {str(e)}", 'pledge': None})
+                    continue
+                
+                is_valid, message = self.validate_pledge(user_id, project_id, amount, reward_tier_id)
+                pledge = Pledge(
+                    id=pledge_id,
+                    user_id=user_id,
+                    project_id=project_id,
+                    reward_tier_id=reward_tier_id,
+                    amount=amount,
+                    status=PledgeStatus.SUCCESS if is_valid else PledgeStatus.REJECTED,
+                    created_at=created_at
+                )
+                if is_valid:
+                    pledge = self._apply_pledge(pledge)
+                else:
+                    pledge = self.pledge_repo.create(pledge)
+                results.append({'index': index, 'success': is_valid, 'message': message, 'pledge': pledge})
+        
+        # Write pledges.csv, projects.csv and reward_tiers.csv once for the whole batch
+        self.journal.checkpoint()
+        return results
+    
     def create_rejected_pledge(self, user_id: int, project_id: str, amount: float, 
                               reward_tier_id: Optional[int] = None, reason: str = "") -> Pledge:
         # Create a rejected pledge for tracking purposes
@@ -217,11 +327,42 @@ class PledgeService:
             created_at=datetime.now()
         )
         
-        return self.pledge_repo.create(pledge)
+        with self.journal.transaction():
+            return self.pledge_repo.create(pledge)
     
     def get_pledges_by_user(self, user_id: int) -> List[Pledge]:
         return self.pledge_repo.get_by_user(user_id)
     
+    def count_user_pledges(self, user_id: int) -> int:
+        return self.pledge_repo.count_by_user(user_id)
+    
+    def get_user_pledge_rows(self, user_id: int, offset: int, limit: int) -> List[Dict[str, Any]]:
+        # One page of a user's pledges, newest first, with project names joined in.
+        # Pages are cut from the end of the file-ordered index, so only the
+        # requested pledges (and their projects) are ever built.
+        total = self.pledge_repo.count_by_user(user_id)
+        stop = max(total - offset, 0)
+        start = max(stop - limit, 0)
+        pledges = self.pledge_repo.get_by_user_range(user_id, start, stop)
+        pledges.reverse()
+        
+        project_names: Dict[str, str] = {}
+        rows = []
+        for pledge in pledges:
+            if pledge.project_id not in project_names:
+                project = self.project_repo.get_by_id(pledge.project_id)
+                project_names[pledge.project_id] = project.name if project else "Unknown"
+            rows.append({
+                'id': pledge.id,
+                'project_id': pledge.project_id,
+                'project_name': project_names[pledge.project_id],
+                'amount': pledge.amount,
+                'reward_tier_id': pledge.reward_tier_id,
+                'status': pledge.status.value,
+                'created_at': pledge.created_at
+            })
+        return rows
+    
     def get_pledges_by_project(self, project_id: str) -> List[Pledge]:
         return self.pledge_repo.get_by_project(project_id)
     
@@ -234,7 +375,7 @@ class PledgeService:
     def get_statistics(self) -> Dict[str, int]:
         return self.pledge_repo.get_statistics()
     
-    def get_project_statistics(self, project_id: str) -> Dict[str, int]:
+    def get_project_statistics(self, project_id: str) -> Dict[str, Any]:
         return self.pledge_repo.get_project_statistics(project_id)
     
     def validate_pledge(self, user_id: int, project_id: str, amount: float, 
@@ -248,7 +389,10 @@ class PledgeService:
             if not project.is_active:
                 return False, "Project deadline has passed"
             
-            # Check amount
+            # Check amount (NaN and infinity would poison the project's total)
+            if not math.isfinite(amount):
+                return False, "Amount must be a finite number"
+            
             if amount <= 0:
                 return False, "Amount must be greater than 0"
             
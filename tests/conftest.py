@@ -0,0 +1,27 @@
+import os
+import re
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from repositories.csv_journal import Journal
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # Run in a private copy of the sample data. Repositories resolve "data" against
+    # the working directory and every process-wide cache is keyed by absolute path,
+    # so each test sees fresh tables, journals and ID sequences.
+    shutil.copytree(os.path.join(ROOT, "data"), tmp_path / "data",
+                    ignore=shutil.ignore_patterns(".*", "journal.log"))
+    # Keep the sample projects open for pledges
+    projects = tmp_path / "data" / "projects.csv"
+    text = re.sub(r",\d{4}-(\d\d-\d\d),(\d+),", r",2030-\1,\2,", projects.read_text(encoding="utf-8"))
+    projects.write_text(text, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    # Checkpoints only happen when a test asks for one
+    monkeypatch.setattr(Journal, "CHECKPOINT_INTERVAL", 3600.0)
+    return tmp_path / "data"
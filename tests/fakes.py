@@ -0,0 +1,32 @@
+import time
+
+class FakeRoot:
+    # Stands in for Tk: after() callbacks run only when the test pumps them
+
+    def __init__(self):
+        self.scheduled = []
+        self.errors = []
+        self._next_id = 0
+
+    def after(self, ms, func):
+        self._next_id += 1
+        self.scheduled.append((self._next_id, func))
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self.scheduled = [item for item in self.scheduled if item[0] != after_id]
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        self.errors.append(exc)
+
+    def pump(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for _, func in scheduled:
+            func()
+
+    def pump_until(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, "condition not reached"
+            time.sleep(0.005)
+            self.pump()
@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from controllers.async_controllers import AsyncCall, ControllerExecutor
+from tests.fakes import FakeRoot
+
+class FlakyDoneFuture(Future):
+    # Reports "not done" on the first done() check, then finishes: the result
+    # arrives between two checks of the same poll
+
+    def __init__(self, result):
+        super().__init__()
+        self._checks = 0
+        self._result_value = result
+
+    def done(self):
+        self._checks += 1
+        if self._checks == 1:
+            return False
+        if not super().done():
+            self.set_result(self._result_value)
+        return True
+
+@pytest.fixture
+def executor():
+    root = FakeRoot()
+    executor = ControllerExecutor(root)
+    yield executor
+    executor.shutdown()
+
+def test_callbacks_run_on_the_polling_thread(executor):
+    root = executor.root
+    log = []
+    polling_thread = threading.get_ident()
+    executor.submit(lambda: 42,
+                    on_success=lambda value: log.append(('success', value, threading.get_ident())),
+                    on_done=lambda: log.append(('done', None, threading.get_ident())))
+    executor.submit(lambda: 1 / 0,
+                    on_error=lambda e: log.append(('error', type(e), threading.get_ident())))
+    root.pump_until(lambda: len(log) == 3)
+
+    assert ('success', 42, polling_thread) in log
+    assert ('done', None, polling_thread) in log
+    assert ('error', ZeroDivisionError, polling_thread) in log
+    assert log.index(('success', 42, polling_thread)) < log.index(('done', None, polling_thread))
+
+def test_unhandled_error_is_reported_to_tk(executor):
+    root = executor.root
+    executor.submit(lambda: 1 / 0)
+    root.pump_until(lambda: root.errors)
+    assert isinstance(root.errors[0], ZeroDivisionError)
+
+def test_call_finishing_during_poll_is_delivered(executor):
+    log = []
+    call = AsyncCall(FlakyDoneFuture('late'), on_success=log.append, on_done=lambda: log.append('done'))
+    executor._calls.append(call)
+
+    # First poll sees it running; it must stay tracked and be delivered next time
+    executor._poll()
+    assert executor._calls == [call]
+    assert log == []
+    executor._poll()
+    assert log == ['late', 'done']
+    assert executor._calls == []
+
+def test_cancelled_call_runs_no_callbacks(executor):
+    root = executor.root
+    release = threading.Event()
+    log = []
+    call = executor.submit(release.wait, on_success=log.append, on_done=lambda: log.append('done'))
+    call.cancel()
+    release.set()
+    root.pump_until(lambda: not executor._calls)
+    assert log == []
+    assert not call.pending
+
+def test_writes_run_in_submission_order(executor):
+    root = executor.root
+    order = []
+    release = threading.Event()
+    # The first write blocks; later ones must still wait for it
+    executor.submit(lambda: (release.wait(), order.append(0)), write=True)
+    for i in range(1, 5):
+        executor.submit(order.append, i, write=True)
+    release.set()
+    root.pump_until(lambda: not executor._calls)
+    assert order == [0, 1, 2, 3, 4]
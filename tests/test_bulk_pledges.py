@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from controllers.csv_controllers import ProjectsController
+from repositories.data_context import DataContext
+
+PROJECT_ID = '10000002'
+
+@pytest.fixture
+def controller(data_dir):
+    return ProjectsController(data_context=DataContext())
+
+def current_amount(controller):
+    return controller.get_project_by_id(PROJECT_ID).current_amount
+
+def test_bad_created_at_rejects_only_its_row(controller):
+    before = current_amount(controller)
+    results = controller.import_pledges([
+        {'user_id': 1, 'project_id': PROJECT_ID, 'amount': 100},
+        {'user_id': 2, 'project_id': PROJECT_ID, 'amount': 200, 'created_at': 'yesterday'},
+        {'user_id': 3, 'project_id': PROJECT_ID, 'amount': 300, 'created_at': '2030-01-01T09:30:00'},
+    ])
+
+    assert [result['success'] for result in results] == [True, False, True]
+    assert results[1]['pledge'] is None
+    assert 'Invalid row' in results[1]['message']
+    assert results[2]['pledge'].created_at.isoformat() == '2030-01-01T09:30:00'
+    assert current_amount(controller) == before + 400
+
+@pytest.mark.parametrize('amount', ['nan', float('nan'), 'inf', float('-inf')])
+def test_non_finite_amount_is_rejected(controller, amount):
+    before = current_amount(controller)
+    results = controller.import_pledges([
+        {'user_id': 1, 'project_id': PROJECT_ID, 'amount': amount},
+        {'user_id': 2, 'project_id': PROJECT_ID, 'amount': 50},
+    ])
+
+    assert [result['success'] for result in results] == [False, True]
+    assert 'finite' in results[0]['message']
+    assert math.isfinite(current_amount(controller))
+    assert current_amount(controller) == before + 50
+
+def test_single_pledge_rejects_non_finite_amount(controller):
+    before = current_amount(controller)
+    success, message = controller.create_pledge(1, PROJECT_ID, float('nan'))
+    assert not success
+    assert 'finite' in message
+    assert current_amount(controller) == before
@@ -0,0 +1,48 @@
+import multiprocessing
+
+from repositories import csv_ids
+from repositories.csv_ids import IdAllocator
+from repositories.csv_repositories import PledgeRepository
+
+def no_rows():
+    return 0
+
+def reserve_blocks(args):
+    # Runs in a child process with its own allocator over the shared sidecar
+    table_path, start, rounds = args
+    start.wait()
+    allocator = IdAllocator(table_path, no_rows)
+    return [(block.start, block.stop) for block in (allocator.reserve(1 + i % 4) for i in range(rounds))]
+
+def test_processes_never_share_ids(tmp_path):
+    table_path = str(tmp_path / "pledges.csv")
+    context = multiprocessing.get_context('spawn')
+    workers = 4
+    with context.Manager() as manager:
+        start = manager.Event()
+        with context.Pool(workers) as pool:
+            pending = pool.map_async(reserve_blocks, [(table_path, start, 100)] * workers)
+            start.set()
+            results = pending.get(timeout=60)
+
+    ids = [i for blocks in results for block in blocks for i in range(*block)]
+    assert len(ids) == len(set(ids))
+    # Blocks are contiguous and the sequence has no gaps across processes
+    assert sorted(ids) == list(range(1, len(ids) + 1))
+
+def test_hand_edited_max_id_is_respected_on_first_use(data_dir, monkeypatch):
+    repo = PledgeRepository()
+    first = repo.reserve_ids(1).start
+    assert first == repo._max_id() + 1
+
+    # Someone adds a row with a much higher ID while the app is not running
+    pledges_csv = data_dir / "pledges.csv"
+    with open(pledges_csv, 'a', newline='', encoding='utf-8') as file:
+        file.write("5000,1,10000001,,10.0,SUCCESS,2030-01-01T00:00:00\r\n")
+
+    # A new process starts with no allocators; the stale sidecar must not win
+    monkeypatch.setattr(csv_ids, '_allocators', {})
+    assert PledgeRepository().reserve_ids(3) == range(5001, 5004)
+    # A sidecar ahead of the table is kept as it is
+    monkeypatch.setattr(csv_ids, '_allocators', {})
+    assert PledgeRepository().reserve_ids(1).start == 5004
@@ -0,0 +1,125 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from models.csv_models import Pledge, PledgeStatus, User
+from repositories.csv_repositories import (PledgeRepository, ProjectRepository, RewardRepository,
+                                           UserRepository)
+from services.csv_services import AuthService
+
+def new_user(name):
+    return User(id=0, username=name, email=f"{name}@example.com", password_hash="x",
+                created_at=datetime(2030, 1, 1))
+
+# Primary keys
+
+def test_primary_index_is_built_once_per_load(data_dir):
+    repo = RewardRepository()
+    assert repo.get_by_id(1).name == "Early Bird Supporter"
+    table = repo._load_table()
+    index = table.indexes['pk']
+    assert repo.get_by_id(2) is not None
+    assert repo.get_by_id(10**9) is None
+    assert repo._load_table().indexes['pk'] is index
+
+def test_project_keys_are_strings(data_dir):
+    repo = ProjectRepository()
+    assert repo.get_by_id('10000001').name == "Smart Learning App for Kids"
+    assert repo.get_by_id('nope') is None
+
+def test_primary_index_follows_writes(data_dir):
+    rewards = RewardRepository()
+    before = rewards.get_by_id(1).remaining_quota
+    assert rewards.decrease_quota(1)
+    assert rewards.get_by_id(1).remaining_quota == before - 1
+
+    users = UserRepository()
+    user = users.create(new_user("indexed"))
+    assert users.get_by_id(user.id).username == "indexed"
+
+def test_rolled_back_insert_leaves_the_index(data_dir):
+    users = UserRepository()
+    with pytest.raises(RuntimeError):
+        with users.transaction():
+            user = users.create(new_user("ghost"))
+            raise RuntimeError("abort")
+    assert users.get_by_id(user.id) is None
+
+# Secondary indexes
+
+def scan(repo):
+    return [repo._to_model(row) for row in repo._load_table().rows]
+
+def test_secondary_indexes_match_a_full_scan(data_dir):
+    pledges = PledgeRepository()
+    all_pledges = scan(pledges)
+    for user_id in {pledge.user_id for pledge in all_pledges}:
+        assert pledges.get_by_user(user_id) == [p for p in all_pledges if p.user_id == user_id]
+    for project_id in {pledge.project_id for pledge in all_pledges}:
+        in_project = [p for p in all_pledges if p.project_id == project_id]
+        assert pledges.get_by_project(project_id) == in_project
+        assert pledges.get_successful_by_project(project_id) == \
+            [p for p in in_project if p.status == PledgeStatus.SUCCESS]
+    for status in PledgeStatus:
+        assert pledges.get_by_status(status) == [p for p in all_pledges if p.status == status]
+
+    rewards = RewardRepository()
+    all_tiers = scan(rewards)
+    for project_id in {tier.project_id for tier in all_tiers}:
+        assert rewards.get_by_project(project_id) == [t for t in all_tiers if t.project_id == project_id]
+
+def test_secondary_indexes_follow_inserts(data_dir):
+    pledges = PledgeRepository()
+    by_user = len(pledges.get_by_user(1))
+    by_project = len(pledges.get_by_project('10000003'))
+    rejected = len(pledges.get_by_status(PledgeStatus.REJECTED))
+    pledge = pledges.create(Pledge(id=0, user_id=1, project_id='10000003', reward_tier_id=None,
+                                   amount=1.0, status=PledgeStatus.REJECTED,
+                                   created_at=datetime(2030, 1, 1)))
+    assert len(pledges.get_by_user(1)) == by_user + 1
+    assert pledges.get_by_project('10000003')[-1] == pledge
+    assert len(pledges.get_by_status(PledgeStatus.REJECTED)) == rejected + 1
+    assert pledge not in pledges.get_successful_by_project('10000003')
+
+# Unique user indexes
+
+def test_username_and_email_lookups_ignore_case(data_dir):
+    users = UserRepository()
+    assert users.username_exists(" JOHN_DOE ")
+    assert users.email_exists("John@Example.COM")
+    assert users.get_by_username("John_Doe").id == 1
+    assert not users.username_exists("john_doe_2")
+
+def test_duplicates_are_rejected_at_insert(data_dir):
+    users = UserRepository()
+    count = len(users.get_all())
+    with pytest.raises(ValueError, match="Username"):
+        users.create(User(id=0, username="John_Doe", email="other@example.com", password_hash="x",
+                          created_at=datetime(2030, 1, 1)))
+    with pytest.raises(ValueError, match="Email"):
+        users.create(User(id=0, username="someone", email="JOHN@example.com ", password_hash="x",
+                          created_at=datetime(2030, 1, 1)))
+    assert len(users.get_all()) == count
+
+def test_concurrent_registrations_of_one_name(data_dir):
+    auth = AuthService(UserRepository())
+    start = threading.Barrier(8)
+    outcomes = []
+
+    def register(i):
+        start.wait()
+        try:
+            auth.register("Camper" if i % 2 else "camper", f"camper{i}@example.com", "secret")
+            outcomes.append(True)
+        except ValueError:
+            outcomes.append(False)
+
+    threads = [threading.Thread(target=register, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count(True) == 1
+    assert auth.login("CAMPER", "secret")
@@ -0,0 +1,148 @@
+import csv
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import pytest
+
+from models.csv_models import Pledge, PledgeStatus
+from repositories import csv_journal
+from repositories.csv_journal import get_journal
+from repositories.csv_repositories import PledgeRepository
+
+def read_rows(path):
+    # Rows as a cold start would see them: straight from the file
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+def strip_final_newline(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+    with open(path, 'wb') as file:
+        file.write(data.rstrip(b'\r\n'))
+
+def new_pledge(amount=123.0):
+    return Pledge(id=0, user_id=1, project_id='10000001', reward_tier_id=None, amount=amount,
+                  status=PledgeStatus.SUCCESS, created_at=datetime(2030, 1, 2, 3, 4, 5, 678901))
+
+def test_checkpoint_appends_after_unterminated_last_line(data_dir):
+    pledges_csv = data_dir / "pledges.csv"
+    strip_final_newline(pledges_csv)
+    before = read_rows(pledges_csv)
+
+    repo = PledgeRepository()
+    journal = repo.journal()
+    with journal.transaction():
+        pledge = repo.create(new_pledge())
+    journal.checkpoint()
+
+    after = read_rows(pledges_csv)
+    assert len(after) == len(before) + 1
+    assert after[:-1] == before
+    assert after[-1]['id'] == str(pledge.id)
+    assert after[-1]['amount'] == '123.0'
+
+def test_replay_after_crash(data_dir, tmp_path, monkeypatch):
+    # The state a crash leaves behind: CSVs from before the transaction plus the
+    # fsynced journal record, which the lost checkpoint never applied
+    strip_final_newline(data_dir / "pledges.csv")
+    crashed = tmp_path / "crashed"
+    shutil.copytree(data_dir, crashed / "data")
+    before = read_rows(crashed / "data" / "pledges.csv")
+
+    repo = PledgeRepository()
+    journal = repo.journal()
+    with journal.transaction():
+        first = repo.create(new_pledge(10.0))
+        second = repo.create(new_pledge(20.0))
+    shutil.copy(journal.path, crashed / "data" / "journal.log")
+
+    monkeypatch.chdir(crashed)
+    recovered = get_journal("data")
+    after = read_rows(crashed / "data" / "pledges.csv")
+    assert after[:-2] == before
+    assert [row['id'] for row in after[-2:]] == [str(first.id), str(second.id)]
+    assert [row['amount'] for row in after[-2:]] == ['10.0', '20.0']
+    # Recovery checkpoints, so the log is empty and a second replay adds nothing
+    assert os.path.getsize(recovered.path) == 0
+    assert recovered.recover() == 0
+    assert len(read_rows(crashed / "data" / "pledges.csv")) == len(after)
+
+def test_replay_stops_at_torn_record(data_dir):
+    first = {'lsn': 1, 'ops': [{'op': 'insert', 'table': 'pledges.csv',
+                                'row': {'id': '9001', 'user_id': '1', 'project_id': '10000001',
+                                        'reward_tier_id': '', 'amount': '5.0', 'status': 'SUCCESS',
+                                        'created_at': '2030-01-01T00:00:00'}}]}
+    with open(data_dir / "journal.log", 'w', encoding='utf-8') as file:
+        file.write(json.dumps(first) + '\n')
+        file.write('{"lsn": 2, "ops": [{"op": "ins')
+
+    journal = get_journal("data")
+    ids = [row['id'] for row in read_rows(data_dir / "pledges.csv")]
+    assert ids.count('9001') == 1
+    assert journal._next_lsn == 2
+
+def test_group_commit_makes_every_transaction_durable(data_dir, monkeypatch):
+    repo = PledgeRepository()
+    journal = repo.journal()
+    threads_count = 20
+
+    # Slow fsyncs let transactions pile up behind the flush in progress
+    fsyncs = []
+    real_fsync = os.fsync
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        threading.Event().wait(0.05)
+        real_fsync(fd)
+    monkeypatch.setattr(csv_journal.os, 'fsync', slow_fsync)
+
+    start = threading.Barrier(threads_count)
+    created = []
+    def worker(i):
+        start.wait()
+        with journal.transaction():
+            created.append(repo.create(new_pledge(float(i + 1))))
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(journal.path, encoding='utf-8') as file:
+        records = [json.loads(line) for line in file]
+    assert sorted(record['lsn'] for record in records) == list(range(1, threads_count + 1))
+    assert len({pledge.id for pledge in created}) == threads_count
+    # Commits were grouped: fewer fsyncs than transactions
+    assert len(fsyncs) < threads_count
+
+    journal.checkpoint()
+    on_disk = {row['id'] for row in read_rows(data_dir / "pledges.csv")}
+    assert {str(pledge.id) for pledge in created} <= on_disk
+
+def test_failed_checkpoint_is_retried_in_full(data_dir, monkeypatch):
+    pledges_csv = data_dir / "pledges.csv"
+    before = read_rows(pledges_csv)
+    repo = PledgeRepository()
+    journal = repo.journal()
+    with journal.transaction():
+        first = repo.create(new_pledge(10.0))
+
+    def unavailable(path):
+        raise OSError("disk unavailable")
+    with monkeypatch.context() as patch:
+        patch.setattr(csv_journal, 'missing_final_newline', unavailable)
+        with pytest.raises(OSError):
+            journal.checkpoint()
+    # Nothing was acknowledged as checkpointed, so the log still holds the record
+    assert os.path.getsize(journal.path) > 0
+
+    with journal.transaction():
+        second = repo.create(new_pledge(20.0))
+    journal.checkpoint()
+
+    after = read_rows(pledges_csv)
+    assert after[:-2] == before
+    assert [row['id'] for row in after[-2:]] == [str(first.id), str(second.id)]
+    assert os.path.getsize(journal.path) == 0
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from models.csv_models import Pledge, PledgeStatus
+from repositories.csv_repositories import PledgeRepository
+
+def test_mapped_mode_reads_what_the_cache_holds(data_dir):
+    cached = PledgeRepository()
+    mapped = PledgeRepository(mapped=True)
+    total = cached.count()
+    assert mapped.count() == total
+    assert mapped.get_range(0, total + 5) == cached.get_range(0, total + 5)
+    assert mapped.get_at(-1) == cached.get_at(-1)
+    assert mapped.get_range(2, 4) == cached.get_all()[2:4]
+    assert mapped.get_statistics() == cached.get_statistics()
+    assert mapped.get_by_user_range(1, 0, 10) == cached.get_by_user_range(1, 0, 10)
+
+def test_mapped_mode_sees_checkpointed_appends(data_dir):
+    cached = PledgeRepository()
+    mapped = PledgeRepository(mapped=True)
+    before = mapped.count()
+    journal = cached.journal()
+    with journal.transaction():
+        pledge = cached.create(Pledge(id=0, user_id=1, project_id='10000001', reward_tier_id=None,
+                                      amount=5.0, status=PledgeStatus.SUCCESS,
+                                      created_at=datetime(2030, 1, 1, 12, 0, 0, 1)))
+    # Not visible to the mapping until the journal writes it back to the file
+    assert mapped.count() == before
+    journal.checkpoint()
+    assert mapped.count() == before + 1
+    assert mapped.get_at(-1) == pledge
+    assert [p.id for p in mapped.get_by_user_range(1, 0, 1000)][-1] == pledge.id
@@ -0,0 +1,39 @@
+import pytest
+
+from repositories.csv_repositories import ProjectRepository
+
+@pytest.fixture
+def repo(data_dir):
+    return ProjectRepository()
+
+def name_substrings(projects, lengths):
+    # Every substring a user could type; the list view strips surrounding whitespace
+    names = [project.name.lower() for project in projects]
+    terms = {name[i:i + n] for name in names for n in lengths for i in range(len(name) - n + 1)}
+    return sorted(term for term in terms if term == term.strip())
+
+def old_search_by_name(projects, term):
+    # The substring scan search_by_name used before the index
+    return {project.id for project in projects if term.lower() in project.name.lower()}
+
+@pytest.mark.parametrize('term', ['ar', 'ea', 'pp', 'rt', 'a', 'E'])
+def test_short_queries_match_substrings(repo, term):
+    assert old_search_by_name(repo.get_all(), term)
+    assert {project.id for project in repo.search_by_name(term)} == old_search_by_name(repo.get_all(), term)
+
+def test_search_by_name_keeps_substring_semantics(repo):
+    projects = repo.get_all()
+    for term in name_substrings(projects, (1, 2, 3, 4)):
+        assert {project.id for project in repo.search_by_name(term)} == old_search_by_name(projects, term), term
+
+def test_list_filter_includes_every_name_match(repo):
+    # The list filter also searches descriptions, so it may only add to the old name matches
+    projects = repo.get_all()
+    for term in name_substrings(projects, (1, 2, 3)):
+        assert old_search_by_name(projects, term) <= repo.search_matches(term, fuzzy=True), term
+
+def test_short_queries_rank_word_starts_first(repo):
+    ids = repo.get_search_index().search('ar', fields=('name',))
+    names = [repo.get_by_id(project_id).name.lower() for project_id in ids]
+    starts = [any(word.startswith('ar') for word in name.split()) for name in names]
+    assert starts == sorted(starts, reverse=True)
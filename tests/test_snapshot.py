@@ -0,0 +1,52 @@
+import os
+
+from repositories.csv_cache import file_signature, table_cache
+from repositories.csv_repositories import CategoryRepository
+from repositories.csv_snapshot import SEPARATOR, load_snapshot, snapshot_path
+
+def cold_start(repo):
+    # What a new process sees: nothing cached, only the files on disk
+    table_cache.invalidate(repo.file_path)
+    table_cache.reset_stats()
+    return repo.get_all()
+
+def test_cold_start_uses_a_matching_snapshot(data_dir):
+    repo = CategoryRepository()
+    parsed = repo.get_all()
+    assert os.path.exists(snapshot_path(repo._load_table().file_path))
+
+    assert cold_start(repo) == parsed
+    assert table_cache.get_statistics()['snapshot_loads'] == 1
+
+def test_edited_csv_makes_the_snapshot_stale(data_dir):
+    categories_csv = data_dir / "categories.csv"
+    repo = CategoryRepository()
+    repo.get_all()
+
+    with open(categories_csv, 'a', newline='', encoding='utf-8') as file:
+        file.write("99,Hand Added,Edited in a spreadsheet\r\n")
+    categories = cold_start(repo)
+    assert table_cache.get_statistics()['snapshot_loads'] == 0
+    assert categories[-1].name == "Hand Added"
+    # The re-parse refreshed the snapshot for the edited file
+    assert load_snapshot(str(categories_csv.resolve()), file_signature(categories_csv)[:2]) is not None
+
+def test_damaged_snapshot_falls_back_to_the_csv(data_dir):
+    repo = CategoryRepository()
+    parsed = repo.get_all()
+    with open(snapshot_path(repo._load_table().file_path), 'wb') as file:
+        file.write(b'not a snapshot')
+
+    assert cold_start(repo) == parsed
+    assert table_cache.get_statistics()['snapshot_loads'] == 0
+
+def test_values_with_the_separator_are_not_snapshotted(data_dir):
+    categories_csv = data_dir / "categories.csv"
+    with open(categories_csv, 'a', newline='', encoding='utf-8') as file:
+        file.write(f"99,Odd{SEPARATOR}Name,Contains the separator\r\n")
+    repo = CategoryRepository()
+    assert repo.get_by_id(99).name == f"Odd{SEPARATOR}Name"
+    assert not os.path.exists(snapshot_path(repo._load_table().file_path))
+
+    assert cold_start(repo)[-1].name == f"Odd{SEPARATOR}Name"
+    assert table_cache.get_statistics()['snapshot_loads'] == 0
@@ -0,0 +1,50 @@
+import os
+
+from repositories.csv_cache import table_cache
+from repositories.csv_repositories import CategoryRepository
+
+def bump_mtime(path):
+    # Make sure an edit is seen as a new version even on coarse-mtime filesystems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+def test_repeated_reads_do_not_reparse(data_dir):
+    repo = CategoryRepository()
+    repo.get_by_id(1)
+    table_cache.reset_stats()
+    for _ in range(5):
+        assert repo.get_by_id(1).name == "Technology"
+        assert len(repo.get_all()) > 1
+    stats = table_cache.get_statistics()
+    assert stats['misses'] == 0
+    assert stats['hits'] >= 10
+
+def test_external_edit_is_picked_up(data_dir):
+    categories_csv = data_dir / "categories.csv"
+    repo = CategoryRepository()
+    count = len(repo.get_all())
+
+    with open(categories_csv, 'a', newline='', encoding='utf-8') as file:
+        file.write("99,Hand Added,Edited in a spreadsheet\r\n")
+    bump_mtime(categories_csv)
+    table_cache.reset_stats()
+    assert len(repo.get_all()) == count + 1
+    assert repo.get_by_id(99).name == "Hand Added"
+    assert table_cache.get_statistics()['misses'] == 1
+
+def test_same_size_rewrite_is_picked_up(data_dir):
+    categories_csv = data_dir / "categories.csv"
+    repo = CategoryRepository()
+    assert repo.get_by_id(1).name == "Technology"
+
+    text = categories_csv.read_text(encoding="utf-8")
+    categories_csv.write_text(text.replace("Technology", "Tekhnology", 1), encoding="utf-8")
+    bump_mtime(categories_csv)
+    assert repo.get_by_id(1).name == "Tekhnology"
+
+def test_deleted_file_reads_as_empty(data_dir):
+    repo = CategoryRepository()
+    assert repo.get_all()
+    os.remove(data_dir / "categories.csv")
+    assert repo.get_all() == []
+    assert repo.get_by_id(1) is None
@@ -0,0 +1,115 @@
+import threading
+from tkinter import ttk
+
+import pytest
+
+from controllers.async_controllers import ControllerExecutor
+from tests.fakes import FakeRoot
+from views.virtual_tree import VirtualTree
+
+class FakeTreeview:
+    # Keeps the children order and values the way ttk.Treeview would
+
+    def __init__(self, *args, **kwargs):
+        self.children = []
+        self.values = {}
+
+    def insert(self, parent, index, iid, values):
+        self.children.insert(len(self.children) if index == "end" else index, iid)
+        self.values[iid] = values
+
+    def move(self, iid, parent, index):
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.children.remove(iid)
+            del self.values[iid]
+
+    def item(self, iid, values):
+        self.values[iid] = values
+
+    def set_children(self, parent, *iids):
+        self.children = list(iids)
+
+    def get_children(self):
+        return tuple(self.children)
+
+    def selection(self):
+        return ()
+
+    def pack(self, **kwargs):
+        pass
+
+    def bind(self, *args):
+        pass
+
+class FakeWidget:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def pack(self, **kwargs):
+        pass
+
+    def set(self, *args):
+        pass
+
+    def lookup(self, *args):
+        return ''
+
+@pytest.fixture
+def tree(monkeypatch):
+    for name, fake in (('Treeview', FakeTreeview), ('Frame', FakeWidget),
+                       ('Scrollbar', FakeWidget), ('Style', FakeWidget)):
+        monkeypatch.setattr(ttk, name, fake)
+    return VirtualTree(None, ("n",), key=lambda row: row, values=lambda row: (row,), height=10)
+
+@pytest.fixture
+def executor():
+    executor = ControllerExecutor(FakeRoot())
+    yield executor
+    executor.shutdown()
+
+def test_paged_source_fetches_pages_in_the_background(tree, executor):
+    rows = list(range(1000))
+    fetch_threads = []
+    loading = []
+    tree.on_loading = loading.append
+
+    def fetch(offset, limit):
+        fetch_threads.append(threading.get_ident())
+        return rows[offset:offset + limit]
+
+    def request(offset, limit, **callbacks):
+        return executor.submit(fetch, offset, limit, **callbacks)
+
+    tree.set_paged_source(len(rows), request)
+    # Nothing is drawn until the first page arrives
+    assert tree.tree.children == []
+    assert tree.loading
+    executor.root.pump_until(lambda: not tree.loading)
+    assert tree.tree.children == [str(i) for i in range(10)]
+    assert loading == [True, False]
+    assert threading.get_ident() not in fetch_threads
+
+    # Scrolling into an unloaded page requests just that page
+    tree.scroll_to(VirtualTree.PAGE_SIZE * 3)
+    executor.root.pump_until(lambda: not tree.loading)
+    assert tree.tree.children[0] == str(VirtualTree.PAGE_SIZE * 3)
+    assert len(fetch_threads) == 2
+
+def test_cancel_requests_drops_pending_pages(tree, executor):
+    release = threading.Event()
+
+    def request(offset, limit, **callbacks):
+        return executor.submit(lambda: (release.wait(), list(range(offset, offset + limit)))[1],
+                               **callbacks)
+
+    tree.set_paged_source(500, request)
+    assert tree.loading
+    tree.cancel_requests()
+    release.set()
+    executor.root.pump_until(lambda: not executor._calls)
+    assert not tree.loading
+    assert tree.tree.children == []
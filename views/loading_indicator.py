@@ -0,0 +1,35 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Optional
+
+class LoadingIndicator:
+    # A busy bar with a message and an optional Cancel button, shown while a
+    # controller call runs in the background and hidden again when it is done
+
+    def __init__(self, parent, on_cancel: Optional[Callable[[], None]] = None):
+        self.frame = ttk.Frame(parent)
+        self.progress_bar = ttk.Progressbar(self.frame, mode="indeterminate", length=120)
+        self.progress_bar.pack(side=tk.LEFT, padx=5)
+        self.message_var = tk.StringVar()
+        ttk.Label(self.frame, textvariable=self.message_var).pack(side=tk.LEFT, padx=5)
+        if on_cancel is not None:
+            ttk.Button(self.frame, text="Cancel", command=on_cancel).pack(side=tk.LEFT, padx=5)
+        self._pack_options = {}
+        self.active = False
+
+    def pack(self, **kwargs):
+        # Remember where to appear; nothing is shown until start()
+        self._pack_options = kwargs
+
+    def start(self, message: str = "Loading..."):
+        self.message_var.set(message)
+        if not self.active:
+            self.active = True
+            self.frame.pack(**self._pack_options)
+            self.progress_bar.start(15)
+
+    def stop(self):
+        if self.active:
+            self.active = False
+            self.progress_bar.stop()
+            self.frame.pack_forget()
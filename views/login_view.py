@@ -1,13 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from controllers.csv_controllers import AuthController
+from controllers.async_controllers import AsyncAuthController, AsyncCall
+from views.loading_indicator import LoadingIndicator
 from typing import Callable, Optional
 
 class LoginView:
-    def __init__(self, parent, auth_controller: AuthController, on_login_success: Callable):
+    def __init__(self, parent, auth_controller: AsyncAuthController, on_login_success: Callable):
         self.parent = parent
         self.auth_controller = auth_controller
         self.on_login_success = on_login_success
+        self._login_call: Optional[AsyncCall] = None
         
         self.frame = ttk.Frame(parent)
         self.setup_ui()
@@ -44,12 +46,16 @@ class LoginView:
         button_frame = ttk.Frame(login_frame)
         button_frame.pack(fill=tk.X, pady=10)
         
-        login_btn = ttk.Button(button_frame, text="Login", command=self.login)
-        login_btn.pack(side=tk.LEFT, padx=(0, 10))
+        self.login_btn = ttk.Button(button_frame, text="Login", command=self.login)
+        self.login_btn.pack(side=tk.LEFT, padx=(0, 10))
         
         register_btn = ttk.Button(button_frame, text="Register", command=self.register)
         register_btn.pack(side=tk.LEFT)
         
+        # Shown under the buttons while the login is checked
+        self.loading = LoadingIndicator(login_frame, on_cancel=self.cancel_login)
+        self.loading.pack(fill=tk.X, after=button_frame)
+        
         # Sample users info
         info_frame = ttk.LabelFrame(main_frame, text="Sample Users (for testing)", padding=10)
         info_frame.pack(fill=tk.X, pady=20)
@@ -76,14 +82,37 @@ class LoginView:
             messagebox.showerror("Error", "Please enter both username and password")
             return
         
-        success, message = self.auth_controller.login(username, password)
-        
+        # Ignore repeated clicks (or Enter presses) while a login is running
+        if self._login_call is not None:
+            return
+        self.login_btn.config(state=tk.DISABLED)
+        self.loading.start("Signing in...")
+        self._login_call = self.auth_controller.login(
+            username, password,
+            on_success=lambda result: self.on_login_result(username, result),
+            on_error=lambda e: messagebox.showerror("Error", f"Login error: {str(e)}"),
+            on_done=self.on_login_done
+        )
+    
+    def on_login_result(self, username: str, result: tuple):
+        success, message = result
         if success:
             messagebox.showinfo("Success", f"Welcome, {username}!")
             self.on_login_success()
         else:
             messagebox.showerror("Error", message)
     
+    def on_login_done(self):
+        self._login_call = None
+        self.login_btn.config(state=tk.NORMAL)
+        self.loading.stop()
+    
+    def cancel_login(self):
+        # Stop waiting for the login and let the user try again
+        if self._login_call is not None:
+            self._login_call.cancel()
+        self.on_login_done()
+    
     def register(self):
         # Mock registration - just show a message
         messagebox.showinfo("Registration", "Registration feature is not implemented.\nPlease use one of the existing sample users:\n\njohn_doe, jane_smith, mike_wilson, sarah_jones, alex_brown,\nemma_davis, david_lee, lisa_wang, tom_chen, anna_kim\n\nPassword: 'password'")
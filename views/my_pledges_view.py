@@ -0,0 +1,162 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from controllers.async_controllers import AsyncAuthController, AsyncCall, AsyncProjectsController
+from views.loading_indicator import LoadingIndicator
+from views.virtual_tree import VirtualTree
+from typing import Dict, Any, Callable, Optional
+
+class MyPledgesView:
+    def __init__(self, parent, auth_controller: AsyncAuthController,
+                 projects_controller: AsyncProjectsController, on_project_select: Callable,
+                 on_back: Callable):
+        self.parent = parent
+        self.auth_controller = auth_controller
+        self.projects_controller = projects_controller
+        self.on_project_select = on_project_select
+        self.on_back = on_back
+
+        self.frame = ttk.Frame(parent)
+        self.user_id = None
+        # Count query in flight; page fetches are tracked by the list itself
+        self._count_call: Optional[AsyncCall] = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        # Setup the My Pledges UI
+        # Header frame
+        header_frame = ttk.Frame(self.frame)
+        header_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        back_btn = ttk.Button(header_frame, text="← Back to Projects", command=self.on_back)
+        back_btn.pack(side=tk.LEFT)
+
+        title_label = ttk.Label(header_frame, text="My Pledges", font=("Arial", 16, "bold"))
+        title_label.pack(side=tk.LEFT, padx=20)
+
+        refresh_btn = ttk.Button(header_frame, text="Refresh", command=self.refresh)
+        refresh_btn.pack(side=tk.RIGHT, padx=5)
+
+        # Pledges list frame
+        list_frame = ttk.Frame(self.frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        # Pledges are fetched a page at a time, in the background, as the list scrolls
+        columns = ("ID", "Project", "Amount", "Reward", "Status", "Date")
+        self.pledge_list = VirtualTree(list_frame, columns, key=lambda pledge: pledge['id'],
+                                       values=self.pledge_values, height=15)
+        self.pledge_list.on_loading = self.on_pages_loading
+        self.tree = self.pledge_list.tree
+
+        # Configure columns
+        self.tree.heading("ID", text="Pledge ID")
+        self.tree.heading("Project", text="Project")
+        self.tree.heading("Amount", text="Amount")
+        self.tree.heading("Reward", text="Reward Tier")
+        self.tree.heading("Status", text="Status")
+        self.tree.heading("Date", text="Date")
+
+        # Column widths
+        self.tree.column("ID", width=80)
+        self.tree.column("Project", width=250)
+        self.tree.column("Amount", width=100)
+        self.tree.column("Reward", width=100)
+        self.tree.column("Status", width=80)
+        self.tree.column("Date", width=140)
+
+        self.pledge_list.pack(fill=tk.BOTH, expand=True)
+
+        # Double-click opens the pledged project
+        self.tree.bind('<Double-1>', self.on_pledge_double_click)
+
+        # Status bar
+        self.status_var = tk.StringVar(value="")
+        status_bar = ttk.Label(self.frame, textvariable=self.status_var, relief=tk.SUNKEN)
+        status_bar.pack(fill=tk.X, side=tk.BOTTOM)
+
+        # Shown above the status bar while pledges load
+        self.loading = LoadingIndicator(self.frame, on_cancel=self.cancel_loading)
+        self.loading.pack(fill=tk.X, side=tk.BOTTOM, after=status_bar)
+
+    def load_pledges(self, keep_position: bool = False):
+        # Count the current user's pledges in the background, then page through them
+        current_user = self.auth_controller.get_current_user()
+        self.user_id = current_user.id if current_user else None
+        self.cancel_loading()
+        if self.user_id is None:
+            self.pledge_list.set_rows([])
+            self.status_var.set("Not logged in")
+            return
+
+        self._count_call = self.projects_controller.count_user_pledges(
+            self.user_id,
+            on_success=lambda total: self.on_count_loaded(total, keep_position),
+            on_error=self.on_load_error,
+            on_done=self.on_count_done
+        )
+        self.update_loading()
+
+    def refresh(self):
+        # Re-read the pledges, keeping the scroll position
+        self.load_pledges(keep_position=True)
+
+    def on_count_loaded(self, total: int, keep_position: bool):
+        self.pledge_list.set_paged_source(total, self.request_pledges, keep_position)
+        self.status_var.set(f"You have made {total} pledges")
+
+    def request_pledges(self, offset: int, limit: int, **callbacks) -> AsyncCall:
+        # One page of pledges for the list, fetched on the worker pool
+        return self.projects_controller.get_user_pledge_rows(
+            self.user_id, offset, limit, on_error=self.on_load_error, **callbacks)
+
+    def on_load_error(self, error: Exception):
+        messagebox.showerror("Error", f"Failed to load pledges: {str(error)}")
+
+    def on_count_done(self):
+        self._count_call = None
+        self.update_loading()
+
+    def on_pages_loading(self, loading: bool):
+        self.update_loading()
+
+    def update_loading(self):
+        # Keep the indicator up while the count or any page is still loading
+        if self._count_call is not None or self.pledge_list.loading:
+            self.loading.start("Loading pledges...")
+        else:
+            self.loading.stop()
+
+    def cancel_loading(self):
+        # Stop waiting for the count and for pages still being fetched
+        if self._count_call is not None:
+            self._count_call.cancel()
+            self._count_call = None
+        self.pledge_list.cancel_requests()
+        self.update_loading()
+
+    def pledge_values(self, pledge: Dict[str, Any]) -> tuple:
+        # Treeview values of a pledge row
+        created_at = pledge['created_at']
+        return (
+            pledge['id'],
+            pledge['project_name'],
+            f"${pledge['amount']:,.2f}",
+            pledge['reward_tier_id'] or "-",
+            pledge['status'],
+            created_at.strftime("%Y-%m-%d %H:%M") if created_at else ""
+        )
+
+    def on_pledge_double_click(self, event):
+        # Open the project of the selected pledge
+        selection = self.pledge_list.selected_rows()
+        if selection:
+            self.on_project_select(selection[0]['project_id'])
+
+    def show(self):
+        # Show the My Pledges view
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        self.load_pledges()
+
+    def hide(self):
+        # Hide the My Pledges view
+        self.cancel_loading()
+        self.frame.pack_forget()
@@ -1,11 +1,14 @@
+import math
 import tkinter as tk
 from tkinter import ttk, messagebox
-from controllers.csv_controllers import ProjectsController
+from controllers.async_controllers import AsyncCall, AsyncProjectsController
+from views.loading_indicator import LoadingIndicator
+from views.tree_binding import TreeBinding
 from models.csv_models import Project
 from typing import Dict, Any, Callable, Optional
 
 class ProjectDetailView:
-    def __init__(self, parent, projects_controller: ProjectsController,
+    def __init__(self, parent, projects_controller: AsyncProjectsController,
                  on_back: Callable):
         self.parent = parent
         self.projects_controller = projects_controller
@@ -14,6 +17,9 @@ class ProjectDetailView:
         self.frame = ttk.Frame(parent)
         self.current_project_id: Optional[str] = None
         self.tier_data = {}  # Initialize tier data storage
+        # Controller calls in flight (run on the worker pool)
+        self._load_call: Optional[AsyncCall] = None
+        self._pledge_call: Optional[AsyncCall] = None
         self.setup_ui()
     
     def setup_ui(self):
@@ -30,6 +36,10 @@ class ProjectDetailView:
         self.title_label = ttk.Label(header_frame, text="", font=("Arial", 16, "bold"))
         self.title_label.pack(side=tk.RIGHT)
         
+        # Shown under the header while the project loads or a pledge is sent
+        self.loading = LoadingIndicator(self.frame, on_cancel=self.cancel_loading)
+        self.loading.pack(fill=tk.X, padx=10, after=header_frame)
+        
         # Main content frame
         main_frame = ttk.Frame(self.frame)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -67,6 +77,16 @@ class ProjectDetailView:
         self.status_label = ttk.Label(left_frame, text="", font=("Arial", 10, "bold"))
         self.status_label.pack(anchor=tk.W, pady=5)
         
+        # Pledge statistics
+        self.backers_label = ttk.Label(left_frame, text="")
+        self.backers_label.pack(anchor=tk.W, pady=2)
+        
+        self.pledges_label = ttk.Label(left_frame, text="")
+        self.pledges_label.pack(anchor=tk.W, pady=2)
+        
+        self.last_pledge_label = ttk.Label(left_frame, text="")
+        self.last_pledge_label.pack(anchor=tk.W, pady=2)
+        
         # Right panel - Pledge form
         right_frame = ttk.LabelFrame(main_frame, text="Make a Pledge", padding=10)
         right_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(5, 0))
@@ -89,8 +109,8 @@ class ProjectDetailView:
         self.reward_combo.set("No reward tier")
         
         # Pledge button
-        pledge_btn = ttk.Button(right_frame, text="Make Pledge", command=self.make_pledge)
-        pledge_btn.pack(pady=10)
+        self.pledge_btn = ttk.Button(right_frame, text="Make Pledge", command=self.make_pledge)
+        self.pledge_btn.pack(pady=10)
         
         # Reward tiers list
         tiers_frame = ttk.LabelFrame(right_frame, text="Available Reward Tiers", padding=5)
@@ -116,20 +136,61 @@ class ProjectDetailView:
         
         # Bind selection event
         self.tiers_tree.bind('<<TreeviewSelect>>', self.on_tier_select)
+        
+        # Reloads after a pledge only touch the tier whose quota changed
+        self.tiers_binding = TreeBinding(self.tiers_tree, key=lambda tier: tier['id'], values=lambda tier: (
+            tier['name'],
+            f"${tier['min_amount']:.2f}",
+            f"{tier['remaining_quota']}/{tier['quota']}"
+        ))
     
     def load_project(self, project_id: str):
-        # Load project details
+        # Load project details in the background
+        self.current_project_id = project_id
+        
+        # Validate controller
+        if not self.projects_controller:
+            messagebox.showerror("Error", "Controller not initialized")
+            return
+        
+        if self._load_call is not None:
+            self._load_call.cancel()
+        self._load_call = self.projects_controller.get_project_details(
+            project_id,
+            on_success=self.on_project_loaded,
+            on_error=self.on_load_error,
+            on_done=self.on_load_done
+        )
+        self.loading.start("Loading project...")
+    
+    def on_load_error(self, error: Exception):
+        error_msg = f"Failed to load project: {str(error)}"
+        print(f"Exception in load_project: {error_msg}")
+        messagebox.showerror("Error", error_msg)
+    
+    def on_load_done(self):
+        self._load_call = None
+        self.update_loading()
+    
+    def update_loading(self):
+        # Keep the indicator up while any call is still running
+        if self._pledge_call is not None:
+            self.loading.start("Sending pledge...")
+        elif self._load_call is not None:
+            self.loading.start("Loading project...")
+        else:
+            self.loading.stop()
+    
+    def cancel_loading(self):
+        # Stop waiting for the project; a pledge already sent is not withdrawn
+        if self._load_call is not None:
+            self._load_call.cancel()
+            self._load_call = None
+        self.update_loading()
+    
+    def on_project_loaded(self, project_data: Optional[Dict[str, Any]]):
+        # Show the loaded project
         try:
-            self.current_project_id = project_id
-            
-            # Validate controller
-            if not self.projects_controller:
-                messagebox.showerror("Error", "Controller not initialized")
-                return
-            
-            # Get project data from controller
-            project_data = self.projects_controller.get_project_details(project_id)
-            
             # Check if we got valid data
             if not project_data or not isinstance(project_data, dict):
                 messagebox.showerror("Error", "Project not found")
@@ -163,20 +224,27 @@ class ProjectDetailView:
             else:
                 self.status_label.config(text="Status: Expired", foreground="red")
             
+            # Pledge statistics
+            self.load_statistics(stats)
+            
             # Load reward tiers
             self.load_reward_tiers(reward_tiers)
             
         except Exception as e:
-            error_msg = f"Failed to load project: {str(e)}"
-            print(f"Exception in load_project: {error_msg}")
-            messagebox.showerror("Error", error_msg)
+            self.on_load_error(e)
+    
+    def load_statistics(self, stats: Dict[str, Any]):
+        # Show the project's pledge statistics
+        self.backers_label.config(text=f"Backers: {stats.get('backers', 0)}")
+        self.pledges_label.config(
+            text=f"Pledges: {stats.get('successful', 0)} successful "
+                 f"(${stats.get('successful_amount', 0):,.2f}), {stats.get('rejected', 0)} rejected")
+        last_pledge_at = stats.get('last_pledge_at')
+        self.last_pledge_label.config(
+            text=f"Last pledge: {last_pledge_at.strftime('%Y-%m-%d %H:%M') if last_pledge_at else 'None yet'}")
     
     def load_reward_tiers(self, reward_tiers):
-        # Load reward tiers into the treeview
-        # Clear existing items
-        for item in self.tiers_tree.get_children():
-            self.tiers_tree.delete(item)
-        
+        # Load reward tiers into the combobox and treeview
         # Update combobox
         tier_options = ["No reward tier"]
         self.tier_data = {}  # Store as instance variable
@@ -195,13 +263,8 @@ class ProjectDetailView:
         self.reward_combo.update_idletasks()
         self.tiers_tree.update_idletasks()
         
-        # Add to treeview
-        for tier in reward_tiers:
-            self.tiers_tree.insert("", tk.END, values=(
-                tier['name'],
-                f"${tier['min_amount']:.2f}",
-                f"{tier['remaining_quota']}/{tier['quota']}"
-            ))
+        # Update treeview, changing only tiers that differ
+        self.tiers_binding.update(reward_tiers)
     
     def on_tier_select(self, event):
         # Handle reward tier selection
@@ -225,6 +288,9 @@ class ProjectDetailView:
         
         try:
             amount = float(self.amount_var.get())
+            if not math.isfinite(amount):
+                messagebox.showerror("Error", "Please enter a valid amount")
+                return
             if amount <= 0:
                 messagebox.showerror("Error", "Amount must be greater than 0")
                 return
@@ -232,16 +298,11 @@ class ProjectDetailView:
             messagebox.showerror("Error", "Please enter a valid amount")
             return
         
-        # Get selected reward tier
+        # Get selected reward tier (from the tiers shown with the project)
         reward_tier_id = None
         selected_tier = self.reward_combo.get()
-        if selected_tier != "No reward tier":
-            # Find the corresponding reward tier
-            project_data = self.projects_controller.get_project_details(self.current_project_id)
-            for tier in project_data['reward_tiers']:
-                if f"{tier['name']} (${tier['min_amount']:.2f})" == selected_tier:
-                    reward_tier_id = tier['id']
-                    break
+        if selected_tier in self.tier_data:
+            reward_tier_id = self.tier_data[selected_tier]['id']
         
         # Make the pledge using authenticated user
         # Get current user from the projects controller's auth service
@@ -255,10 +316,18 @@ class ProjectDetailView:
             messagebox.showerror("Error", "You must be logged in to make a pledge")
             return
         
-        success, message = self.projects_controller.create_pledge(
-            current_user.id, self.current_project_id, amount, reward_tier_id
+        # One pledge at a time; the button is enabled again when it completes
+        self.pledge_btn.config(state=tk.DISABLED)
+        self._pledge_call = self.projects_controller.create_pledge(
+            current_user.id, self.current_project_id, amount, reward_tier_id,
+            on_success=self.on_pledge_result,
+            on_error=lambda error: messagebox.showerror("Pledge Failed", str(error)),
+            on_done=self.on_pledge_done
         )
-        
+        self.update_loading()
+    
+    def on_pledge_result(self, result: tuple):
+        success, message = result
         if success:
             messagebox.showinfo("Success", message)
             # Reload project to show updated amounts
@@ -266,10 +335,16 @@ class ProjectDetailView:
         else:
             messagebox.showerror("Pledge Failed", message)
     
+    def on_pledge_done(self):
+        self._pledge_call = None
+        self.pledge_btn.config(state=tk.NORMAL)
+        self.update_loading()
+    
     def show(self):
         # Show the project detail view
         self.frame.pack(fill=tk.BOTH, expand=True)
     
     def hide(self):
         # Hide the project detail view
+        self.cancel_loading()
         self.frame.pack_forget()
@@ -1,18 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from controllers.csv_controllers import ProjectsController
+from controllers.async_controllers import AsyncCall, AsyncProjectsController
+from views.loading_indicator import LoadingIndicator
+from views.virtual_tree import VirtualTree
 from models.csv_models import Project
-from typing import List, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
 
 class ProjectsListView:
-    def __init__(self, parent, projects_controller: ProjectsController, 
+    # Wait this long after the last keystroke before searching (ms)
+    SEARCH_DELAY_MS = 250
+    
+    def __init__(self, parent, projects_controller: AsyncProjectsController, 
                  on_project_select: Callable):
         self.parent = parent
         self.projects_controller = projects_controller
         self.on_project_select = on_project_select
         
         self.frame = ttk.Frame(parent)
-        self.current_projects: List[Project] = []
+        self.current_projects: List[Dict[str, Any]] = []
+        
+        # Queries run on the controller worker pool; starting a new one cancels the
+        # one in flight, so only the newest request's result is ever shown
+        self._query: Optional[AsyncCall] = None
+        self._search_after_id: Optional[str] = None
+        # (sort, search) of the newest request and of the rows on screen; re-showing
+        # the same query (a refresh) keeps the scroll position
+        self._latest_query: Optional[Tuple[str, str]] = None
+        self._shown_query: Optional[Tuple[str, str]] = None
+        
         self.setup_ui()
         self.load_projects()
     
@@ -59,9 +74,11 @@ class ProjectsListView:
         list_frame = ttk.Frame(self.frame)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        # Treeview for projects
+        # Virtual treeview for projects: only the rows in view exist as Tk items
         columns = ("ID", "Name", "Category", "Target", "Current", "Progress", "Deadline", "Status")
-        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=15)
+        self.project_list = VirtualTree(list_frame, columns, key=lambda project: project['id'],
+                                        values=self.project_values, height=15)
+        self.tree = self.project_list.tree
         
         # Configure columns
         self.tree.heading("ID", text="Project ID")
@@ -83,13 +100,8 @@ class ProjectsListView:
         self.tree.column("Deadline", width=100)
         self.tree.column("Status", width=80)
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Pack treeview and scrollbar
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Pack the list (it brings its own scrollbar)
+        self.project_list.pack(fill=tk.BOTH, expand=True)
         
         # Bind double-click event
         self.tree.bind('<Double-1>', self.on_project_double_click)
@@ -98,57 +110,87 @@ class ProjectsListView:
         self.status_var = tk.StringVar(value="Ready")
         status_bar = ttk.Label(self.frame, textvariable=self.status_var, relief=tk.SUNKEN)
         status_bar.pack(fill=tk.X, side=tk.BOTTOM)
+        
+        # Shown above the status bar while a query runs
+        self.loading = LoadingIndicator(self.frame, on_cancel=self.cancel_loading)
+        self.loading.pack(fill=tk.X, side=tk.BOTTOM, after=status_bar)
     
     def load_projects(self):
-        # Load projects from database
-        try:
-            self.status_var.set("Loading projects...")
-            self.frame.update()
-            
-            # Get projects based on current sort
-            sort_by = self.sort_var.get()
-            self.current_projects = self.projects_controller.get_projects_sorted(sort_by)
-            
-            # Apply search filter if any
-            search_term = self.search_var.get().strip()
-            if search_term:
-                self.current_projects = [p for p in self.current_projects 
-                                       if search_term.lower() in p.name.lower()]
-            
-            self.populate_tree()
-            self.status_var.set(f"Loaded {len(self.current_projects)} projects")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load projects: {str(e)}")
-            self.status_var.set("Error loading projects")
-    
-    def populate_tree(self):
-        # Populate the treeview with projects
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Add projects
-        for project in self.current_projects:
-            # Get category name from category_id
-            category_name = self.projects_controller.get_category_name(project.category_id)
-            status = "Active" if project.is_active else "Expired"
-            
-            self.tree.insert("", tk.END, values=(
-                project.id,
-                project.name,
-                category_name,
-                f"${project.target_amount:,.2f}",
-                f"${project.current_amount:,.2f}",
-                f"{project.progress_percentage:.1f}%",
-                project.deadline.strftime("%Y-%m-%d"),
-                status
-            ))
+        # Load projects for the current sort and search filter without blocking the UI
+        self._cancel_pending_search()
+        self.status_var.set("Loading projects...")
+        
+        # Tk variables are read here, on the Tk thread; the worker only sees plain values
+        sort_by = self.sort_var.get()
+        search_term = self.search_var.get().strip()
+        self._latest_query = (sort_by, search_term)
+        if self._query is not None:
+            self._query.cancel()
+        self._query = self.projects_controller.get_project_rows(
+            sort_by, search_term,
+            on_success=self.on_projects_loaded,
+            on_error=self.on_load_error,
+            on_done=self.on_load_done
+        )
+        self.loading.start("Loading projects...")
     
-    def on_search_change(self, event=None):
-        # Handle search text change
+    def on_projects_loaded(self, rows: List[Dict[str, Any]]):
+        # Show the result of the newest query
+        self.current_projects = rows
+        self.populate_tree(keep_position=self._latest_query == self._shown_query)
+        self._shown_query = self._latest_query
+        self.status_var.set(f"Loaded {len(self.current_projects)} projects")
+    
+    def on_load_error(self, error: Exception):
+        messagebox.showerror("Error", f"Failed to load projects: {str(error)}")
+        self.status_var.set("Error loading projects")
+    
+    def on_load_done(self):
+        self._query = None
+        self.loading.stop()
+    
+    def cancel_loading(self):
+        # Drop the query in flight and keep showing the current rows
+        self._cancel_pending_search()
+        if self._query is not None:
+            self._query.cancel()
+            self._query = None
+            self.status_var.set("Loading cancelled")
+        self.loading.stop()
+    
+    def _cancel_pending_search(self):
+        if self._search_after_id is not None:
+            self.frame.after_cancel(self._search_after_id)
+            self._search_after_id = None
+    
+    def _run_debounced_search(self):
+        self._search_after_id = None
         self.load_projects()
     
+    def populate_tree(self, keep_position: bool = False):
+        # Show the projects; only the rows around the viewport are materialized
+        self.project_list.set_rows(self.current_projects, keep_position)
+    
+    def project_values(self, project: Dict[str, Any]) -> tuple:
+        # Treeview values of a list row (rows come with their category names joined in)
+        status = "Active" if project['is_active'] else "Expired"
+        
+        return (
+            project['id'],
+            project['name'],
+            project['category'],
+            f"${project['target_amount']:,.2f}",
+            f"${project['current_amount']:,.2f}",
+            f"{project['progress_percentage']:.1f}%",
+            project['deadline'].strftime("%Y-%m-%d"),
+            status
+        )
+    
+    def on_search_change(self, event=None):
+        # Handle search text change: restart the delay on every keystroke
+        self._cancel_pending_search()
+        self._search_after_id = self.frame.after(self.SEARCH_DELAY_MS, self._run_debounced_search)
+    
     def on_sort_change(self, event=None):
         # Handle sort option change
         self.load_projects()
@@ -168,4 +210,5 @@ class ProjectsListView:
     
     def hide(self):
         # Hide the projects list view
+        self.cancel_loading()
         self.frame.pack_forget()
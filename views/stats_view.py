@@ -1,15 +1,20 @@
 import tkinter as tk
 from tkinter import ttk
-from controllers.csv_controllers import StatsController, ProjectsController
+from controllers.async_controllers import AsyncCall, AsyncProjectsController, AsyncStatsController
+from views.loading_indicator import LoadingIndicator
+from views.tree_binding import TreeBinding
 from typing import Dict, Any, List
 
 class StatsView:
-    def __init__(self, parent, stats_controller: StatsController, 
-                 projects_controller: ProjectsController):
+    def __init__(self, parent, stats_controller: AsyncStatsController, 
+                 projects_controller: AsyncProjectsController):
         self.parent = parent
         self.stats_controller = stats_controller
         self.projects_controller = projects_controller
         
+        # Controller calls in flight (run on the worker pool)
+        self._calls: List[AsyncCall] = []
+        
         self.frame = ttk.Frame(parent)
         self.setup_ui()
         self.load_statistics()
@@ -21,6 +26,10 @@ class StatsView:
                                font=("Arial", 16, "bold"))
         title_label.pack(pady=20)
         
+        # Shown under the title while statistics load
+        self.loading = LoadingIndicator(self.frame, on_cancel=self.cancel_loading)
+        self.loading.pack(padx=20, after=title_label)
+        
         # Main content frame
         main_frame = ttk.Frame(self.frame)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
@@ -113,16 +122,54 @@ class StatsView:
         self.top_projects_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         top_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Refreshes only touch the rows that changed
+        self.top_projects_binding = TreeBinding(self.top_projects_tree, key=lambda project: project['id'],
+                                                values=lambda project: (
+            project['rank'],
+            project['name'],
+            f"${project['current_amount']:,.2f}",
+            f"${project['target_amount']:,.2f}",
+            f"{project['progress_percentage']:.1f}%",
+            project['category']
+        ))
+        
         # Refresh button
         refresh_btn = ttk.Button(main_frame, text="Refresh Statistics", command=self.load_statistics)
         refresh_btn.pack(pady=10)
     
     def load_statistics(self):
-        # Load and display statistics
+        # Load statistics and top projects in the background, side by side
+        self.cancel_loading()
+        self._calls = [
+            self.stats_controller.get_overall_statistics(
+                on_success=self.show_overall_statistics,
+                on_error=lambda e: print(f"Error loading statistics: {str(e)}"),
+                on_done=self.on_load_done
+            ),
+            self.stats_controller.get_top_projects(
+                10,
+                on_success=self.show_top_projects,
+                on_error=lambda e: print(f"Error loading top projects: {str(e)}"),
+                on_done=self.on_load_done
+            )
+        ]
+        self.loading.start("Loading statistics...")
+    
+    def on_load_done(self):
+        self._calls = [call for call in self._calls if call.pending]
+        if not self._calls:
+            self.loading.stop()
+    
+    def cancel_loading(self):
+        # Stop waiting for statistics still loading
+        for call in self._calls:
+            call.cancel()
+        self._calls = []
+        self.loading.stop()
+    
+    def show_overall_statistics(self, overall_stats: Dict[str, Any]):
+        # Display overall statistics
         try:
-            # Get overall statistics
-            overall_stats = self.stats_controller.get_overall_statistics()
-            
             # Update pledge statistics
             pledge_stats = overall_stats['pledges']
             self.total_pledges_label.config(text=f"Total Pledges: {pledge_stats['total']}")
@@ -144,32 +191,15 @@ class StatsView:
             self.overall_progress_label.config(text=f"Overall Progress: {progress:.1f}%")
             self.overall_progress_var.set(progress)
             
-            # Load top projects
-            self.load_top_projects()
-            
         except Exception as e:
             print(f"Error loading statistics: {str(e)}")
     
-    def load_top_projects(self):
-        # Load top funded projects
+    def show_top_projects(self, top_projects: List[Dict[str, Any]]):
+        # Display top funded projects
         try:
-            # Clear existing items
-            for item in self.top_projects_tree.get_children():
-                self.top_projects_tree.delete(item)
-            
-            # Get top projects
-            top_projects = self.stats_controller.get_top_projects(10)
-            
-            # Add projects to treeview
-            for i, project in enumerate(top_projects, 1):
-                self.top_projects_tree.insert("", tk.END, values=(
-                    i,
-                    project['name'],
-                    f"${project['current_amount']:,.2f}",
-                    f"${project['target_amount']:,.2f}",
-                    f"{project['progress_percentage']:.1f}%",
-                    project['category']
-                ))
+            # Update treeview, changing only rows whose rank or amounts differ
+            self.top_projects_binding.update(
+                dict(project, rank=i) for i, project in enumerate(top_projects, 1))
                 
         except Exception as e:
             print(f"Error loading top projects: {str(e)}")
@@ -181,4 +211,5 @@ class StatsView:
     
     def hide(self):
         # Hide the statistics view
+        self.cancel_loading()
         self.frame.pack_forget()
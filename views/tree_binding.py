@@ -0,0 +1,124 @@
+import bisect
+from tkinter import ttk
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Sequence, Tuple
+
+class TreeBinding:
+    # Keeps a ttk.Treeview in step with a list of rows by key. Every Tk call costs a
+    # round trip per item, so instead of deleting and re-inserting everything, update()
+    # diffs the new rows against what is shown and only deletes, inserts, moves or
+    # re-values the items that changed. Each row's key doubles as its Treeview item ID.
+
+    # Past this many out-of-place rows, one set_children call beats individual moves
+    MAX_MOVES = 64
+
+    def __init__(self, tree: ttk.Treeview, key: Callable[[Any], Hashable],
+                 values: Callable[[Any], Sequence[Any]]):
+        self.tree = tree
+        self.key = key
+        self.values = values
+        # item ID -> values last written to it, so unchanged rows need no Tk call
+        self._shown: Dict[str, Tuple[Any, ...]] = {}
+        self._order: List[str] = []
+
+    def update(self, rows: Iterable[Any]) -> Dict[str, int]:
+        # Show exactly these rows in this order; returns how many items were touched
+        new_items: List[Tuple[str, Tuple[Any, ...]]] = []
+        seen = set()
+        for row in rows:
+            iid = str(self.key(row))
+            if iid in seen:
+                continue
+            seen.add(iid)
+            new_items.append((iid, tuple(self.values(row))))
+
+        changes = {'deleted': 0, 'inserted': 0, 'moved': 0, 'updated': 0}
+
+        # Delete items that are no longer in the result, in one call
+        stale = [iid for iid in self._order if iid not in seen]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self._shown[iid]
+            changes['deleted'] = len(stale)
+        current = [iid for iid in self._order if iid in seen]
+
+        # Items that are already in the right order relative to each other stay put;
+        # every other item is moved (or inserted) right after its new predecessor
+        new_positions = {iid: i for i, (iid, _) in enumerate(new_items)}
+        staying = self._in_order(current, new_positions)
+        if len(current) - len(staying) > self.MAX_MOVES:
+            self._reorder(new_items, changes)
+            self._order = [iid for iid, _ in new_items]
+            return changes
+
+        # cursor is the position of the last placed item, so lookups only scan forward
+        cursor = -1
+        for iid, values in new_items:
+            if iid not in self._shown:
+                cursor += 1
+                self.tree.insert("", cursor, iid=iid, values=values)
+                current.insert(cursor, iid)
+                changes['inserted'] += 1
+            else:
+                if iid in staying:
+                    cursor = current.index(iid, cursor + 1)
+                else:
+                    old_index = current.index(iid)
+                    del current[old_index]
+                    if old_index <= cursor:
+                        cursor -= 1
+                    cursor += 1
+                    self.tree.move(iid, "", cursor)
+                    current.insert(cursor, iid)
+                    changes['moved'] += 1
+                if self._shown[iid] != values:
+                    self.tree.item(iid, values=values)
+                    changes['updated'] += 1
+            self._shown[iid] = values
+
+        self._order = [iid for iid, _ in new_items]
+        return changes
+
+    def _reorder(self, new_items: List[Tuple[str, Tuple[Any, ...]]], changes: Dict[str, int]):
+        # Bulk path for large reorders (e.g. a new sort): insert and re-value rows as
+        # needed, then put every item in order with a single Tk call
+        for iid, values in new_items:
+            if iid not in self._shown:
+                self.tree.insert("", "end", iid=iid, values=values)
+                changes['inserted'] += 1
+            elif self._shown[iid] != values:
+                self.tree.item(iid, values=values)
+                changes['updated'] += 1
+            self._shown[iid] = values
+        self.tree.set_children("", *(iid for iid, _ in new_items))
+        changes['moved'] = len(new_items)
+
+    @staticmethod
+    def _in_order(current: List[str], new_positions: Dict[str, int]) -> set:
+        # Longest run of current items whose new positions are increasing (patience sorting)
+        tails: List[int] = []       # tails[k]: index into current ending the best run of length k + 1
+        parents: List[int] = [-1] * len(current)
+        tail_positions: List[int] = []
+        for i, iid in enumerate(current):
+            position = new_positions[iid]
+            k = bisect.bisect_left(tail_positions, position)
+            parents[i] = tails[k - 1] if k > 0 else -1
+            if k == len(tails):
+                tails.append(i)
+                tail_positions.append(position)
+            else:
+                tails[k] = i
+                tail_positions[k] = position
+        staying = set()
+        i = tails[-1] if tails else -1
+        while i >= 0:
+            staying.add(current[i])
+            i = parents[i]
+        return staying
+
+    def clear(self):
+        # Remove every bound item
+        if self._order:
+            self.tree.delete(*self._order)
+        self._shown = {}
+        self._order = []
@@ -0,0 +1,226 @@
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from views.tree_binding import TreeBinding
+
+class VirtualTree:
+    # A Treeview that only ever holds the rows in view. The list itself lives behind
+    # two callables, count() and fetch(offset, limit), so it can be an in-memory list
+    # or a paged query. Rows are fetched a page at a time as the user scrolls (a few
+    # pages are kept), and the visible window is drawn through a TreeBinding, so
+    # scrolling by one row moves one item instead of redrawing the view.
+    #
+    # A paged source (set_paged_source) fetches pages in the background instead:
+    # request(offset, limit, on_success=..., on_done=...) starts a controller call
+    # and returns it. The window shows the rows already loaded and is redrawn as
+    # missing pages arrive; on_loading(bool) reports whether any page is pending.
+
+    # Rows fetched per request, and how many fetched pages are kept
+    PAGE_SIZE = 200
+    CACHED_PAGES = 8
+    # Fallback row height (pixels) when the theme does not report one
+    DEFAULT_ROW_HEIGHT = 20
+
+    def __init__(self, parent, columns: Sequence[str], key: Callable[[Any], Hashable],
+                 values: Callable[[Any], Sequence[Any]], height: int = 15):
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=tuple(columns), show="headings", height=height)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.binding = TreeBinding(self.tree, key=key, values=values)
+        self.key = key
+
+        self._count: Callable[[], int] = lambda: 0
+        self._fetch: Callable[[int, int], List[Any]] = lambda offset, limit: []
+        self._total = 0
+        self._pages: "OrderedDict[int, List[Any]]" = OrderedDict()
+        # Paged source: page number -> call fetching it
+        self._request: Optional[Callable[..., Any]] = None
+        self._requests: Dict[int, Any] = {}
+        self.on_loading: Optional[Callable[[bool], None]] = None
+        self.offset = 0
+        self.visible_rows = height
+        # item ID -> row of the rows currently shown
+        self._window: Dict[str, Any] = {}
+
+        style = ttk.Style(self.tree)
+        row_height = style.lookup("Treeview", "rowheight")
+        self.row_height = int(row_height) if row_height else self.DEFAULT_ROW_HEIGHT
+
+        self.tree.bind('<Configure>', self.on_configure)
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_rows(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_rows(3))
+        self.tree.bind('<Up>', lambda event: self.on_arrow(-1))
+        self.tree.bind('<Down>', lambda event: self.on_arrow(1))
+        self.tree.bind('<Prior>', lambda event: self.scroll_rows(-self.visible_rows) or "break")
+        self.tree.bind('<Next>', lambda event: self.scroll_rows(self.visible_rows) or "break")
+        self.tree.bind('<Home>', lambda event: self.scroll_to(0) or "break")
+        self.tree.bind('<End>', lambda event: self.scroll_to(self._total) or "break")
+
+    # Data source
+
+    def set_source(self, count: Callable[[], int], fetch: Callable[[int, int], List[Any]],
+                   keep_position: bool = False):
+        # Show a new list; keep_position leaves the view where it was (e.g. on refresh)
+        self._count = count
+        self._fetch = fetch
+        self._request = None
+        self.refresh(keep_position)
+
+    def set_paged_source(self, total: int, request: Callable[..., Any], keep_position: bool = False):
+        # Show a list of total rows whose pages are fetched in the background
+        self._count = lambda: total
+        self._fetch = lambda offset, limit: []
+        self._request = request
+        self.refresh(keep_position)
+
+    def set_rows(self, rows: List[Any], keep_position: bool = False):
+        # Show an in-memory list
+        self.set_source(lambda: len(rows), lambda offset, limit: rows[offset:offset + limit],
+                        keep_position)
+
+    def refresh(self, keep_position: bool = True):
+        # Re-read the row count and the rows in view
+        self.cancel_requests()
+        self._pages.clear()
+        self._total = self._count()
+        self.scroll_to(self.offset if keep_position else 0)
+
+    def __len__(self) -> int:
+        return self._total
+
+    def _rows(self, offset: int, limit: int) -> List[Any]:
+        # Rows [offset, offset + limit), fetching whole pages as needed
+        rows: List[Any] = []
+        page = offset // self.PAGE_SIZE
+        while len(rows) < limit and page * self.PAGE_SIZE < self._total:
+            cached = self._pages.get(page)
+            if cached is None and self._request is not None:
+                # Not loaded yet: show what is there and redraw when it arrives
+                self._request_page(page)
+                break
+            if cached is None:
+                cached = self._fetch(page * self.PAGE_SIZE, self.PAGE_SIZE)
+                self._pages[page] = cached
+                while len(self._pages) > self.CACHED_PAGES:
+                    self._pages.popitem(last=False)
+            else:
+                self._pages.move_to_end(page)
+            start = max(offset - page * self.PAGE_SIZE, 0)
+            rows.extend(cached[start:start + limit - len(rows)])
+            if len(cached) < self.PAGE_SIZE:
+                break
+            page += 1
+        return rows
+
+    def _request_page(self, page: int):
+        if page in self._requests:
+            return
+        was_loading = bool(self._requests)
+        self._requests[page] = self._request(
+            page * self.PAGE_SIZE, self.PAGE_SIZE,
+            on_success=lambda rows: self._page_loaded(page, rows),
+            on_done=lambda: self._page_done(page)
+        )
+        if not was_loading and self.on_loading is not None:
+            self.on_loading(True)
+
+    def _page_loaded(self, page: int, rows: List[Any]):
+        self._pages[page] = rows
+        while len(self._pages) > self.CACHED_PAGES:
+            self._pages.popitem(last=False)
+        # Redraw if the page falls in the window
+        first = self.offset // self.PAGE_SIZE
+        last = (self.offset + self.visible_rows - 1) // self.PAGE_SIZE
+        if first <= page <= last:
+            self.scroll_to(self.offset)
+
+    def _page_done(self, page: int):
+        self._requests.pop(page, None)
+        if not self._requests and self.on_loading is not None:
+            self.on_loading(False)
+
+    def cancel_requests(self):
+        # Stop waiting for pages still being fetched
+        if not self._requests:
+            return
+        for call in self._requests.values():
+            call.cancel()
+        self._requests = {}
+        if self.on_loading is not None:
+            self.on_loading(False)
+
+    @property
+    def loading(self) -> bool:
+        return bool(self._requests)
+
+    # Scrolling
+
+    def scroll_to(self, offset: int):
+        # Show the rows starting at offset (clamped to the list)
+        offset = max(0, min(offset, self._total - self.visible_rows))
+        self.offset = offset
+        rows = self._rows(offset, self.visible_rows)
+        self._window = {str(self.key(row)): row for row in rows}
+        self.binding.update(rows)
+        if self._total:
+            self.scrollbar.set(offset / self._total, min(offset + len(rows), self._total) / self._total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_rows(self, delta: int):
+        self.scroll_to(self.offset + delta)
+
+    def on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None):
+        # Scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units"/"pages")
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self._total))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def on_arrow(self, delta: int):
+        # Move the selection, scrolling the window when it reaches an edge
+        selection = self.tree.selection()
+        items = list(self.tree.get_children())
+        if not selection or not items:
+            return None
+        index = items.index(selection[0]) + delta
+        if 0 <= index < len(items):
+            return None
+        self.scroll_rows(delta)
+        items = list(self.tree.get_children())
+        if items:
+            target = items[0] if delta < 0 else items[-1]
+            self.tree.selection_set(target)
+            self.tree.focus(target)
+        return "break"
+
+    def on_configure(self, event):
+        # Fit the window to the widget's height
+        heading = self.row_height + 4
+        rows = max(1, (event.height - heading) // self.row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.scroll_to(self.offset)
+
+    # Selection
+
+    def selected_rows(self) -> List[Any]:
+        # Rows behind the selected items
+        return [self._window[iid] for iid in self.tree.selection() if iid in self._window]
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def bind(self, sequence: str, func: Callable):
+        self.tree.bind(sequence, func)